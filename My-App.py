@@ -3,6 +3,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
 
+from session_cache import memoize_in_session, upload_signatures
+from sniffing import sniff_csv, read_sniffed_csv
+
 st.set_page_config(layout="wide")
 st.title("📊 Asset Data Visualizer")
 
@@ -10,8 +13,14 @@ st.title("📊 Asset Data Visualizer")
 uploaded_file = st.file_uploader("Upload your CSV file", type=["csv"])
 
 if uploaded_file is not None:
-    # Step 2: Load CSV
-    df = pd.read_csv(uploaded_file)
+    # Step 2: Load CSV (parsed once per upload, reused by every sidebar rerun)
+    file_key = upload_signatures(uploaded_file)
+    def load_upload():
+        notes = []
+        return read_sniffed_csv(uploaded_file, sniff_csv(uploaded_file), notes=notes), notes
+    df, read_notes = memoize_in_session("viz_df", file_key, load_upload)
+    for message in read_notes:
+        st.warning(message)
     st.success("File uploaded successfully!")
 
     st.write("### Preview of Data")
@@ -23,7 +32,9 @@ if uploaded_file is not None:
 
         # Select asset column
         asset_column = st.selectbox("Select Asset Name Column", df.columns)
-        asset_names = df[asset_column].unique().tolist()
+        asset_names = memoize_in_session(
+            "viz_assets", (file_key, asset_column), lambda: df[asset_column].unique().tolist()
+        )
         selected_assets = st.multiselect("Select Asset(s)", asset_names)
 
         # Select measurement columns (only numeric)
@@ -33,11 +44,13 @@ if uploaded_file is not None:
         # Select date column
         date_column = st.selectbox("Select Date Column", df.columns)
 
-        # Convert date column to datetime for filtering
+        # Convert date column to datetime for filtering (once per upload and column)
         try:
-            df[date_column] = pd.to_datetime(df[date_column])
-            min_date = df[date_column].min().date()
-            max_date = df[date_column].max().date()
+            dates = memoize_in_session(
+                "viz_dates", (file_key, date_column), lambda: pd.to_datetime(df[date_column])
+            )
+            min_date = dates.min().date()
+            max_date = dates.max().date()
             selected_date_range = st.date_input("Select Date Range", [min_date, max_date])
         except Exception as e:
             st.error(f"Date conversion error: {e}")
@@ -48,10 +61,10 @@ if uploaded_file is not None:
         start_date, end_date = selected_date_range
         mask = (
             df[asset_column].isin(selected_assets) &
-            (df[date_column] >= pd.to_datetime(start_date)) &
-            (df[date_column] <= pd.to_datetime(end_date))
+            (dates >= pd.to_datetime(start_date)) &
+            (dates <= pd.to_datetime(end_date))
         )
-        filtered_df = df[mask]
+        filtered_df = df[mask].assign(**{date_column: dates[mask]})
 
         if not filtered_df.empty:
             st.write("### 📈 Interactive Line Chart (Plotly)")
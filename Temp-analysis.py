@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 
+from master_lookup import load_master_lookup, describe_duplicates, describe_unmatched
+from sniffing import sniff_csv, read_sniffed_csv, parse_timestamps
+
 # === Settings ===
 active_power_threshold = 500
 temp_columns = [
@@ -37,10 +40,10 @@ if not uploaded_files or not master_file:
     st.info("Please upload both main CSV files and the master lookup Excel file to proceed.")
     st.stop()
 
-# Read master Excel file
+# Read master Excel file (parsed once per file content, then served from cache)
 try:
-    master_df = pd.read_excel(master_file)
-    if 'Asset Name' not in master_df.columns or 'Site' not in master_df.columns:
+    lookup = load_master_lookup(master_file)
+    if 'Site' not in lookup.columns:
         st.error("Master Excel file must contain 'Asset Name' and 'Site' columns.")
         st.stop()
 except Exception as e:
@@ -51,9 +54,13 @@ except Exception as e:
 raw_dfs = []
 for uploaded_file in uploaded_files:
     try:
-        df = pd.read_csv(uploaded_file)
+        sniff = sniff_csv(uploaded_file, expected_columns=temp_columns, timestamp_column='Date')
+        notes = []
+        df = read_sniffed_csv(uploaded_file, sniff, notes=notes)
+        for message in notes:
+            st.warning(message)
         if 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date'], format='%d-%m-%Y %H:%M:%S', errors='coerce')
+            df['Date'] = parse_timestamps(df['Date'], sniff)
         if not df.empty:
             raw_dfs.append(df)
     except Exception as e:
@@ -78,8 +85,15 @@ filtered_df = compiled_df[compiled_df['ActivepowerGeneration'] > 0]
 # Max aggregation per Asset Name
 max_df = filtered_df.groupby('Asset Name')[temp_columns + ['ActivepowerGeneration']].max().reset_index()
 
-# Merge with master lookup to get Site info
-result_df = max_df.merge(master_df[['Asset Name', 'Site']], on='Asset Name', how='left')
+# Join with master lookup by asset code to get Site info
+asset_codes = lookup.encode(max_df['Asset Name'])
+result_df = lookup.enrich(max_df, asset_codes, ['Site'])
+duplicate_assets = describe_duplicates(lookup)
+if duplicate_assets:
+    st.warning(duplicate_assets)
+unmatched_assets = lookup.unmatched(max_df['Asset Name'], asset_codes)
+if unmatched_assets:
+    st.warning(describe_unmatched(unmatched_assets))
 
 # Add temperature flags
 result_df['Temp11'] = (result_df[temp_columns[0]] >= 80).astype(int)
@@ -0,0 +1,79 @@
+# alignment.py
+
+import numpy as np
+import pandas as pd
+
+from availability import BCT_FRAME_COLUMNS
+from memory_plan import EXPORT_CELL_BYTES
+
+# === Settings ===
+ALIGNED_COLUMNS = ['Active Power', 'Wind Speed']
+BCT_ALIGN_COLUMNS = BCT_FRAME_COLUMNS + ['Wind Speed']
+DEFAULT_TOLERANCE_MINUTES = 5
+
+
+# === As-of join ===
+def align_power(temp_df, bct_chunks, tolerance_minutes=DEFAULT_TOLERANCE_MINUTES, direction='nearest'):
+    # Every temperature row picks up the BCT sample of the same asset nearest in
+    # time, if one lies within the tolerance. bct_chunks is a frame or an
+    # iterable of frames (a chunked read). Temperature asset names are
+    # factorized once into integer codes, BCT names are mapped onto them, and
+    # merge_asof matches all assets of a chunk in one pass (by=code); across
+    # chunks each row keeps its closest match.
+    # Returns temp_df (reindexed 0..n-1) plus BCT Timestamp, Active Power and
+    # Wind Speed; rows without a match keep NaT/NaN there.
+    if isinstance(bct_chunks, pd.DataFrame):
+        bct_chunks = [bct_chunks]
+    n = len(temp_df)
+    codes, names = pd.factorize(temp_df['Asset Name'].to_numpy(dtype=object), use_na_sentinel=True)
+    names = pd.Index(names)
+
+    left = pd.DataFrame({
+        'Time': pd.to_datetime(temp_df['Date'].to_numpy()).astype('datetime64[ns]'),
+        'Code': codes,
+        'Row': np.arange(n),
+    })
+    # merge_asof needs non-null keys sorted on the time column.
+    left = left[left['Time'].notna() & (left['Code'] >= 0)].sort_values('Time', kind='stable')
+
+    matched = pd.DataFrame({'BCT Timestamp': pd.Series(pd.NaT, index=range(n), dtype='datetime64[ns]')})
+    for col in ALIGNED_COLUMNS:
+        matched[col] = np.nan
+    gap = np.full(n, np.inf)
+    tolerance = pd.Timedelta(minutes=tolerance_minutes)
+
+    for bct_df in bct_chunks:
+        bct_time = pd.to_datetime(bct_df['Timestamp'].to_numpy()).astype('datetime64[ns]')
+        right = pd.DataFrame({
+            'Time': bct_time,
+            'Code': names.get_indexer(bct_df['Asset Name'].to_numpy(dtype=object)),
+            'BCT Timestamp': bct_time,
+        })
+        for col in ALIGNED_COLUMNS:
+            right[col] = pd.to_numeric(bct_df[col].to_numpy(), errors='coerce') if col in bct_df else np.nan
+        right = right[right['Time'].notna() & (right['Code'] >= 0)].sort_values('Time', kind='stable')
+        if right.empty:
+            continue
+
+        merged = pd.merge_asof(left, right, on='Time', by='Code', tolerance=tolerance, direction=direction)
+        rows = merged['Row'].to_numpy()
+        chunk_gap = (merged['BCT Timestamp'] - merged['Time']).abs().dt.total_seconds().to_numpy()
+        closer = chunk_gap < gap[rows]  # unmatched rows (NaN) never win
+        rows = rows[closer]
+        gap[rows] = chunk_gap[closer]
+        for col in ['BCT Timestamp'] + ALIGNED_COLUMNS:
+            matched.loc[rows, col] = merged[col].to_numpy()[closer]
+
+    return pd.concat([temp_df.reset_index(drop=True), matched], axis=1)
+
+
+def alignment_footprint(temp_df):
+    # Bytes the alignment holds whatever the size of the BCT uploads: the
+    # temperature frame and its aligned copy, the join keys and one merge
+    # result per chunk, and the Aligned Data sheet of the report.
+    n = len(temp_df)
+    frame = int(temp_df.memory_usage(deep=True).sum())
+    added = 1 + len(ALIGNED_COLUMNS)
+    working = n * 8 * (3 + 2 * (3 + added))
+    export = n * (len(temp_df.columns) + added) * EXPORT_CELL_BYTES
+    return 2 * frame + working + export
@@ -0,0 +1,182 @@
+# app_pages/bct_availability.py
+
+import streamlit as st
+from datetime import datetime
+
+from availability import (
+    load_bct_data, count_bct_data, plan_bct_load,
+    build_availability, build_availability_from_counts, build_availability_excel,
+)
+from fanout import bct_site_worker
+from grids import render_paged_grid, status_rules
+from jobs import content_hash, get_runner, resume_job, retry_requested, submit_job, wait_for_job
+from master_lookup import load_master_lookup, describe_duplicates, describe_unmatched
+from memory_plan import PeakMemory, describe_usage, usage_report
+from session_cache import upload_signatures
+from site_reports import site_fanout_section
+
+# === BCT JOBS ===
+# Run on the background job pool; progress(fraction, message) feeds the UI.
+def run_bct_pipeline(progress, master_file, uploaded_csvs, plan):
+    progress(0.05, "Reading master file")
+    lookup = load_master_lookup(master_file)
+    with PeakMemory() as meter:
+        if plan.mode == 'chunked':
+            # Only daily counts per asset are kept; no row-level frame for the fan-out.
+            frame, errors = count_bct_data(uploaded_csvs, progress, plan.chunk_rows)
+            compiled_df = None
+        else:
+            frame, errors = load_bct_data(uploaded_csvs, progress)
+            compiled_df = frame
+        if frame.empty:
+            raise ValueError("No valid rows found in the uploaded CSV files. " + " ".join(errors))
+        progress(0.7, "Computing availability")
+        codes = lookup.encode(frame['Asset Name'])
+        if plan.mode == 'chunked':
+            sheets = build_availability_from_counts(frame, lookup, codes)
+        else:
+            sheets = build_availability(frame, lookup, codes)
+    return {
+        'sheets': sheets,
+        'errors': errors,
+        'unmatched': lookup.unmatched(frame['Asset Name'], codes),
+        'compiled': compiled_df,
+        'master': lookup,
+        'memory': usage_report(plan, meter, compiled_df, *sheets),
+    }
+
+def run_bct_excel(progress, sheets):
+    progress(0.1, "Writing workbook")
+    return build_availability_excel(*sheets)
+
+# === BCT FRAGMENTS ===
+# Paging/sorting the grid or preparing the download reruns only the fragment
+# that owns the widget, never the ingestion or aggregation job above it.
+@st.fragment
+def availability_table_fragment(sheet3_pivot):
+    render_paged_grid(sheet3_pivot, "result_data", column_rules=status_rules(sheet3_pivot.columns[2:]), pinned=2)
+
+@st.fragment
+def availability_export_fragment(job_id, sheets):
+    excel_job = get_runner().get(f"{job_id}-xlsx")
+    if excel_job is None and not st.button("📄 Prepare Excel File"):
+        return
+    if excel_job is None or retry_requested(f"{job_id}-xlsx"):
+        excel_job = submit_job(None, f"{job_id}-xlsx", "Excel export", run_bct_excel, sheets)
+        if excel_job is None:
+            return
+    if not wait_for_job(excel_job):
+        return
+    st.download_button(
+        label="📥 Download Final Excel File",
+        data=excel_job.result,
+        file_name=f"data_availability_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        on_click="ignore"
+    )
+
+@st.fragment
+def availability_fanout_fragment(job_id, compiled_df, lookup):
+    st.subheader("🏭 Per-Site Workbooks")
+    if compiled_df is None:
+        st.caption("Per-site workbooks need the row-level data, which is not kept when uploads are processed in chunks.")
+        return
+    site_fanout_section(f"{job_id}-sites", compiled_df, lookup, bct_site_worker, "data_availability")
+
+# --- PROCESS 1: BCT Data Availability Dashboard ---
+st.title("📈 BCT Data Availability Dashboard")
+
+# --- CUSTOM STYLING ---
+st.markdown("""
+    <style>
+        body {
+            background-color: #ffffff;
+        }
+        .reportview-container .main .block-container {
+            padding-top: 2rem;
+            padding-bottom: 2rem;
+        }
+        .stButton>button {
+            background-color: #009999;
+            color: white;
+            border-radius: 8px;
+            padding: 0.6em 1em;
+        }
+        .stDownloadButton>button {
+            background-color: #0066cc;
+            color: white;
+            border-radius: 8px;
+            padding: 0.6em 1em;
+            font-weight: bold;
+        }
+        h1, h2, h3 {
+            color: #004d66;
+        }
+        .custom-table thead tr {
+            background-color: #004d66;
+            color: white;
+        }
+        .custom-table td, .custom-table th {
+            border: 1px solid #ccc;
+            padding: 8px 12px;
+        }
+        .custom-table {
+            border-collapse: collapse;
+            width: 100%;
+        }
+    </style>
+""", unsafe_allow_html=True)
+
+# --- FILE UPLOAD ---
+st.header("📂 Upload Required Files")
+
+col1, col2 = st.columns(2)
+with col1:
+    master_file = st.file_uploader("Upload Master Excel File", type=["xlsx"])
+with col2:
+    uploaded_csvs = st.file_uploader(
+        "Upload CSV Files",
+        type=["csv"],
+        accept_multiple_files=True
+    )
+
+# === PROCESSING ===
+# Ingestion and aggregation run as a background job keyed by the upload
+# signatures; the job id lives in the URL so a reload picks the result up again.
+if master_file and uploaded_csvs:
+    st.success("✅ Files uploaded successfully!")
+    # Sized from a sample of each upload before anything is loaded.
+    plan = plan_bct_load(uploaded_csvs)
+    if plan.mode == 'refuse':
+        st.error(plan.message)
+        bct_job = None
+    else:
+        if plan.mode == 'chunked':
+            st.info(plan.message)
+        job_id = content_hash("bct", upload_signatures(master_file), upload_signatures(uploaded_csvs))
+        bct_job = submit_job("bct_job", job_id, "BCT availability", run_bct_pipeline, master_file, uploaded_csvs, plan)
+else:
+    bct_job = resume_job("bct_job")
+    if bct_job is None:
+        st.info("Please upload both Master Excel and at least one CSV file to continue.")
+    elif bct_job.status == 'done':
+        st.info("Showing results from your previous upload.")
+
+if bct_job is not None and wait_for_job(bct_job):
+    sheet1, sheet2_pivot, sheet3_pivot = bct_job.result['sheets']
+    for message in bct_job.result['errors']:
+        st.error(message)
+    duplicates = describe_duplicates(bct_job.result['master'])
+    if duplicates:
+        st.warning(duplicates)
+    if bct_job.result['unmatched']:
+        st.warning(describe_unmatched(bct_job.result['unmatched']))
+    st.caption(describe_usage(bct_job.result['memory']))
+
+    # === DISPLAY TABLES ===
+    st.header("🔍 Preview of Processed Data")
+    availability_table_fragment(sheet3_pivot)
+
+    # === DOWNLOAD BUTTON ===
+    availability_export_fragment(bct_job.id, bct_job.result['sheets'])
+    availability_fanout_fragment(bct_job.id, bct_job.result['compiled'], bct_job.result['master'])
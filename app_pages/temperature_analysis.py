@@ -0,0 +1,246 @@
+# app_pages/temperature_analysis.py
+
+import streamlit as st
+import pandas as pd
+
+from alignment import ALIGNED_COLUMNS, BCT_ALIGN_COLUMNS, DEFAULT_TOLERANCE_MINUTES, align_power, alignment_footprint
+from availability import iter_bct_chunks, load_bct_data, plan_bct_load
+from fanout import temperature_site_worker
+from grids import render_paged_grid, threshold_rules
+from jobs import content_hash, get_runner, resume_job, retry_requested, submit_job, wait_for_job
+from master_lookup import load_master_lookup, describe_duplicates, describe_unmatched
+from memory_plan import PeakMemory, describe_usage, usage_report
+from session_cache import upload_signatures
+from site_reports import site_fanout_section
+from temperature import (
+    temp_columns, thresholds, plan_temperature_load, process_data, process_data_chunked,
+    create_excel, plot_exceedance_charts_plotly,
+)
+
+# --- PROCESS 2: Temperature & Power Analysis ---
+st.title("Temperature and Power Data Processor")
+
+# === Jobs ===
+def run_temperature_job(progress, csv_files, plan):
+    with PeakMemory() as meter:
+        if plan.mode == 'chunked':
+            result = process_data_chunked(csv_files, progress, plan.chunk_rows)
+        else:
+            result = process_data(csv_files, progress)
+    memory = usage_report(plan, meter, *result[:4])
+    # Sized here, once per job, so uploading BCT files does not rescan the frame on every rerun.
+    memory['alignment_footprint'] = alignment_footprint(result[0])
+    return result + (memory,)
+
+def run_alignment_job(progress, compiled_df, bct_files, tolerance, plan):
+    if plan.mode == 'chunked':
+        # Each BCT chunk is joined as it is read; only the best match per row is kept.
+        errors = []
+        loaded = []
+        def chunks():
+            for chunk in iter_bct_chunks(bct_files, errors, progress, plan.chunk_rows, BCT_ALIGN_COLUMNS):
+                loaded.append(len(chunk))
+                yield chunk
+        aligned_df = align_power(compiled_df, chunks(), tolerance)
+        if not sum(loaded):
+            raise ValueError("No valid BCT rows loaded. " + " ".join(errors))
+        return aligned_df, errors
+    bct_df, errors = load_bct_data(bct_files, progress, columns=BCT_ALIGN_COLUMNS)
+    if bct_df.empty:
+        raise ValueError("No valid BCT rows loaded. " + " ".join(errors))
+    progress(0.7, "Aligning power and wind onto the temperature timeline")
+    return align_power(compiled_df, bct_df, tolerance), errors
+
+def run_temperature_excel(progress, compiled_df, filtered_df, max_df, result_df, aligned_df=None):
+    progress(0.1, "Writing workbook")
+    return create_excel(compiled_df, filtered_df, max_df, result_df, aligned_df).getvalue()
+
+# === Streamlit Fragments ===
+# Asset/metric filters rerun the script, but ingestion is a background job keyed
+# on the upload signatures; the date range, grid paging and the export each rerun only the
+# fragment that owns them.
+@st.fragment
+def temp_summary_fragment(result_df, selected_assets, selected_metrics):
+    if selected_assets:
+        result_df = result_df[result_df['Asset Name'].isin(selected_assets)]
+
+    # 🔍 Show only selected columns in the result
+    display_columns = ['Asset Name'] + selected_metrics + ['ActivepowerGeneration']
+    filtered_result_df = result_df[display_columns]
+
+    # Display filtered result table
+    st.subheader("📋 Result Data with Flags")
+    render_paged_grid(filtered_result_df, "temp_result", column_rules=threshold_rules(thresholds), pinned=1)
+
+@st.fragment
+def temp_export_fragment(job_id, compiled_df, filtered_df, max_df, result_df, aligned_df=None):
+    # Download full result (not just filtered)
+    excel_job = get_runner().get(f"{job_id}-xlsx")
+    if excel_job is None and not st.button("📄 Prepare Excel Report"):
+        return
+    if excel_job is None or retry_requested(f"{job_id}-xlsx"):
+        excel_job = submit_job(
+            None, f"{job_id}-xlsx", "Excel report", run_temperature_excel,
+            compiled_df, filtered_df, max_df, result_df, aligned_df
+        )
+        if excel_job is None:
+            return
+    if not wait_for_job(excel_job):
+        return
+    st.download_button(
+        label="Download Excel Report",
+        data=excel_job.result,
+        file_name="final_report.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        on_click="ignore"
+    )
+
+@st.fragment
+def temp_fanout_fragment(job_id, compiled_df):
+    st.subheader("🏭 Per-Site Reports")
+    master_file = st.file_uploader("Upload Master Excel File (Asset Name, Site)", type=["xlsx"], key="temp_master")
+    if master_file is None:
+        st.caption("Upload the master lookup to split the report into one workbook per site.")
+        return
+    try:
+        lookup = load_master_lookup(master_file)
+    except Exception as e:
+        st.error(f"Error reading master Excel file: {e}")
+        return
+    if 'Site' not in lookup.columns:
+        st.error("Master Excel file must contain 'Asset Name' and 'Site' columns.")
+        return
+    duplicates = describe_duplicates(lookup)
+    if duplicates:
+        st.warning(duplicates)
+    unmatched = lookup.unmatched(compiled_df['Asset Name'], lookup.encode(compiled_df['Asset Name']))
+    if unmatched:
+        st.warning(describe_unmatched(unmatched))
+    fanout_job_id = content_hash("temp-sites", job_id, upload_signatures(master_file))
+    site_fanout_section(fanout_job_id, compiled_df, lookup, temperature_site_worker, "temperature_report")
+
+@st.fragment
+def temp_charts_fragment(compiled_df, selected_assets, selected_metrics, secondary_metrics=None):
+    # Date range filter
+    min_date = compiled_df['Date'].min()
+    max_date = compiled_df['Date'].max()
+    selected_date_range = st.date_input(
+        "Select Date Range:",
+        value=(min_date.date(), max_date.date()),
+        min_value=min_date.date(),
+        max_value=max_date.date()
+    )
+
+    # === Apply Filters ===
+    filtered_view_df = compiled_df
+
+    # Filter by asset
+    if selected_assets:
+        filtered_view_df = filtered_view_df[filtered_view_df['Asset Name'].isin(selected_assets)]
+
+    # Filter by date
+    if selected_date_range and len(selected_date_range) == 2:
+        start_date = pd.to_datetime(selected_date_range[0])
+        end_date = pd.to_datetime(selected_date_range[1])
+        filtered_view_df = filtered_view_df[
+            (filtered_view_df['Date'] >= start_date) & 
+            (filtered_view_df['Date'] <= end_date)
+        ]
+
+    if filtered_view_df.empty:
+        st.warning("⚠️ No data matching selected filters.")
+        return
+
+    st.success(f"✅ Showing data for {len(filtered_view_df)} rows.")
+
+    # 📈 Plot filtered charts
+    st.subheader("📈 Temperature Exceedance Charts")
+    charts = plot_exceedance_charts_plotly(filtered_view_df, selected_metrics, secondary_metrics)
+
+    if not charts:
+        st.info("No temperature exceedance detected for selected filters.")
+    else:
+        for asset, fig in charts.items():
+            st.markdown(f"**{asset}**")
+            st.plotly_chart(fig, use_container_width=True)
+
+# === Streamlit UI ===
+
+uploaded_files = st.file_uploader("Upload CSV files", accept_multiple_files=True, type='csv')
+
+if uploaded_files:
+    # Sized from a sample of each upload before anything is loaded.
+    plan = plan_temperature_load(uploaded_files)
+    if plan.mode == 'refuse':
+        st.error(plan.message)
+        temp_job = None
+    else:
+        job_id = content_hash("temp", upload_signatures(uploaded_files))
+        temp_job = submit_job("temp_job", job_id, "Temperature analysis", run_temperature_job, uploaded_files, plan)
+else:
+    temp_job = resume_job("temp_job")
+
+if temp_job is not None and wait_for_job(temp_job):
+    compiled_df, filtered_df, max_df, result_df, read_errors, memory = temp_job.result
+    for message in read_errors:
+        st.warning(message)
+    chunked = memory['plan'].mode == 'chunked'
+    if chunked:
+        st.info(memory['plan'].message + " Charts and the compiled/filtered sheets show hourly maxima "
+                "per asset; the maxima and flags are exact.")
+    st.caption(describe_usage(memory))
+
+    # Optional BCT exports put power and wind on the temperature timeline
+    # (per-asset as-of join); aligned data feeds the charts and the report.
+    st.subheader("⚡ Power & Wind Alignment")
+    bct_files = st.file_uploader(
+        "Upload BCT CSV Files (optional, for power & wind)", accept_multiple_files=True, type='csv', key="temp_bct"
+    )
+    aligned_df = None
+    export_id = temp_job.id
+    if bct_files:
+        tolerance = st.number_input(
+            "Alignment tolerance (minutes)", min_value=0, max_value=180, value=DEFAULT_TOLERANCE_MINUTES
+        )
+        # Planned like the main upload, with the temperature frame and the
+        # Aligned Data sheet counted as held whatever the BCT size.
+        align_plan = plan_bct_load(bct_files, BCT_ALIGN_COLUMNS, memory['alignment_footprint'], aggregate=False)
+        align_job = None
+        if align_plan.mode == 'refuse':
+            st.error(align_plan.message)
+        else:
+            if align_plan.mode == 'chunked':
+                st.info(align_plan.message)
+            align_id = content_hash("temp-align", temp_job.id, upload_signatures(bct_files), tolerance)
+            align_job = submit_job(
+                None, align_id, "Power alignment", run_alignment_job, compiled_df, bct_files, tolerance, align_plan
+            )
+        if align_job is not None and wait_for_job(align_job):
+            aligned_df, bct_errors = align_job.result
+            export_id = align_job.id
+            for message in bct_errors:
+                st.warning(message)
+            matched = int(aligned_df['BCT Timestamp'].notna().sum())
+            st.caption(f"{matched} of {len(aligned_df)} temperature rows matched a BCT sample within {tolerance} min.")
+
+    st.subheader("Filter Options")
+
+    # Asset selection
+    assets = compiled_df['Asset Name'].unique()
+    selected_assets = st.multiselect("Select Assets:", options=assets, default=assets)
+
+    # Temperature parameter selection
+    selected_metrics = st.multiselect(
+        "Select Temperature Parameters:",
+        options=temp_columns,
+        default=temp_columns
+    )
+
+    temp_summary_fragment(result_df, selected_assets, selected_metrics)
+    temp_export_fragment(export_id, compiled_df, filtered_df, max_df, result_df, aligned_df)
+    # Bucket maxima of powered rows reproduce the exact per-site maxima.
+    temp_fanout_fragment(temp_job.id, filtered_df if chunked else compiled_df)
+    if aligned_df is not None:
+        temp_charts_fragment(aligned_df, selected_assets, selected_metrics, ALIGNED_COLUMNS)
+    else:
+        temp_charts_fragment(compiled_df, selected_assets, selected_metrics)
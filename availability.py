@@ -0,0 +1,193 @@
+# availability.py
+
+import io
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from memory_plan import CHUNK_ROWS, plan_memory
+from sniffing import BCT_COLUMNS, sniff_csv, read_sniffed_csv, parse_timestamps
+
+BCT_FRAME_COLUMNS = ['Timestamp', 'Date', 'Asset Name', 'Active Power']
+BCT_SNIFF = {'expected_columns': BCT_COLUMNS, 'timestamp_column': 0}
+BCT_READ = {'names': BCT_COLUMNS, 'on_bad_lines': 'skip'}
+
+
+# === BCT PIPELINE ===
+def prepare_bct_frame(df, sniff, columns=BCT_FRAME_COLUMNS):
+    df['Timestamp'] = parse_timestamps(df['Timestamp'], sniff)
+    df['Date'] = df['Timestamp'].dt.date
+    df = df.dropna(subset=['Timestamp', 'Asset Name'])
+    return df[columns]
+
+
+def plan_bct_load(uploaded_csvs, columns=BCT_FRAME_COLUMNS, resident_bytes=0, aggregate=True):
+    # aggregate=True: the availability run, which exports the rows (plus Make
+    # and Site) in memory and daily counts per asset when chunked. False: the
+    # rows are only joined onto a frame the caller holds (resident_bytes).
+    return plan_memory(
+        uploaded_csvs, f"bct:{','.join(columns)}", partial(prepare_bct_frame, columns=columns),
+        BCT_SNIFF, BCT_READ, time_column='Timestamp',
+        bucket_seconds=24 * 3600 if aggregate else None,
+        export_copies=1 if aggregate else 0, export_columns=2,
+        resident_bytes=resident_bytes,
+    )
+
+
+def load_bct_data(uploaded_csvs, progress=None, columns=BCT_FRAME_COLUMNS):
+    all_data = []
+    errors = []
+    for i, file in enumerate(uploaded_csvs):
+        if progress:
+            progress(0.1 + 0.5 * i / len(uploaded_csvs), f"Reading {file.name}")
+        try:
+            sniff = sniff_csv(file, **BCT_SNIFF)
+            df = read_sniffed_csv(file, sniff, notes=errors, **BCT_READ)
+            all_data.append(prepare_bct_frame(df, sniff, columns))
+        except Exception as e:
+            errors.append(f"Error reading {file.name}: {e}")
+
+    if not all_data:
+        return pd.DataFrame(columns=columns), errors
+    return pd.concat(all_data, ignore_index=True), errors
+
+
+def iter_bct_chunks(uploaded_csvs, errors, progress=None, chunk_rows=CHUNK_ROWS, columns=BCT_FRAME_COLUMNS):
+    # Prepared frames of at most chunk_rows rows, file after file; read errors
+    # are appended to errors and the next file is tried.
+    for i, file in enumerate(uploaded_csvs):
+        if progress:
+            progress(0.1 + 0.5 * i / len(uploaded_csvs), f"Streaming {file.name}")
+        try:
+            sniff = sniff_csv(file, **BCT_SNIFF)
+            with read_sniffed_csv(file, sniff, notes=errors, chunksize=chunk_rows, **BCT_READ) as reader:
+                for chunk in reader:
+                    yield prepare_bct_frame(chunk, sniff, columns)
+        except Exception as e:
+            errors.append(f"Error reading {file.name}: {e}")
+
+
+def _sum_counts(parts):
+    return pd.concat(parts).groupby(level=[0, 1]).sum()
+
+
+def count_bct_data(uploaded_csvs, progress=None, chunk_rows=CHUNK_ROWS):
+    # Chunked counterpart of load_bct_data for uploads too large to hold in
+    # memory: each file is streamed chunk_rows rows at a time and only record
+    # counts per (Asset Name, Date) are kept.
+    all_counts = []
+    errors = []
+    for i, file in enumerate(uploaded_csvs):
+        if progress:
+            progress(0.1 + 0.5 * i / len(uploaded_csvs), f"Streaming {file.name}")
+        try:
+            sniff = sniff_csv(file, **BCT_SNIFF)
+            file_counts = []
+            with read_sniffed_csv(file, sniff, notes=errors, chunksize=chunk_rows, **BCT_READ) as reader:
+                for chunk in reader:
+                    chunk = prepare_bct_frame(chunk, sniff)
+                    file_counts.append(chunk.groupby(['Asset Name', 'Date']).size())
+                    if len(file_counts) >= 16:
+                        file_counts = [_sum_counts(file_counts)]
+            all_counts.extend(file_counts)
+        except Exception as e:
+            errors.append(f"Error reading {file.name}: {e}")
+
+    if not all_counts:
+        return pd.DataFrame(columns=['Asset Name', 'Date', 'Count']), errors
+    return _sum_counts(all_counts).rename('Count').reset_index(), errors
+
+
+def build_availability(compiled_df, lookup, codes=None):
+    # Rows are joined to the master by asset code; unmatched rows (code -1)
+    # keep NaN Make/Site and drop out of the per-site sheets.
+    if codes is None:
+        codes = lookup.encode(compiled_df['Asset Name'])
+
+    # === SHEET 1 ===
+    sheet1 = lookup.enrich(compiled_df, codes)
+
+    matched = codes >= 0
+    code_counts = pd.DataFrame({
+        'Code': codes[matched],
+        'Date': compiled_df['Date'].to_numpy()[matched],
+    }).groupby(['Code', 'Date']).size().reset_index(name='Count')
+    all_dates = sorted(compiled_df['Date'].dropna().unique())
+    return (sheet1,) + summarise_availability(code_counts, lookup, all_dates)
+
+
+def build_availability_from_counts(counts, lookup, codes=None):
+    # Same sheets from count_bct_data output; sheet 1 lists the daily record
+    # counts per asset instead of the raw rows.
+    if codes is None:
+        codes = lookup.encode(counts['Asset Name'])
+    sheet1 = lookup.enrich(counts, codes)
+
+    matched = codes >= 0
+    code_counts = pd.DataFrame({
+        'Code': codes[matched],
+        'Date': counts['Date'].to_numpy()[matched],
+        'Count': counts['Count'].to_numpy()[matched],
+    }).groupby(['Code', 'Date'], as_index=False)['Count'].sum()
+    all_dates = sorted(counts['Date'].dropna().unique())
+    return (sheet1,) + summarise_availability(code_counts, lookup, all_dates)
+
+
+def summarise_availability(sheet2_counts, lookup, all_dates):
+    # sheet2_counts holds record counts per (asset Code, Date), matched assets only.
+
+    # === SHEET 2 ===
+    sheet2 = pd.concat([lookup.gather(sheet2_counts['Code'].to_numpy(), ['Make', 'Site']), sheet2_counts], axis=1)
+    site_counts = sheet2.groupby(['Make', 'Site', 'Date'])['Count'].sum()
+    sheet2 = site_counts.reset_index()
+    sheet2_pivot = sheet2.pivot(index=['Make', 'Site'], columns='Date', values='Count').fillna(0).astype(int)
+    sheet2_pivot.columns = [col.strftime('%d-%m-%Y') for col in sheet2_pivot.columns]
+    sheet2_pivot.reset_index(inplace=True)
+
+    # === SHEET 3 ===
+    # Average records per asset for every (Make, Site) in the master and every
+    # date in the data; sites without any rows on a date average 0.
+    total_assets = lookup.frame.groupby(['Make', 'Site']).size()
+    avg = site_counts.unstack('Date') if not site_counts.empty else pd.DataFrame(index=total_assets.index)
+    avg = avg.reindex(index=total_assets.index, columns=all_dates).fillna(0)
+    avg = avg.div(total_assets, axis=0)
+    sheet3_pivot = pd.DataFrame(
+        np.where(avg.to_numpy() >= 130, "Data Available", "Data Not Available"),
+        index=avg.index,
+        columns=[col.strftime('%d-%m-%Y') for col in all_dates],
+    )
+    sheet3_pivot.reset_index(inplace=True)
+
+    return sheet2_pivot, sheet3_pivot
+
+
+def build_availability_excel(sheet1, sheet2_pivot, sheet3_pivot):
+    # openpyxl is only needed for exports, so it is not imported with the page.
+    from openpyxl import load_workbook
+    from openpyxl.styles import PatternFill
+
+    # === EXPORT TO EXCEL ===
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        sheet1.to_excel(writer, index=False, sheet_name='Compiled Data')
+        sheet2_pivot.to_excel(writer, index=False, sheet_name='Compiled Summary')
+        sheet3_pivot.to_excel(writer, index=False, sheet_name='Result Data')
+
+    # === COLOR SHEET 3 (EXCEL) ===
+    output.seek(0)
+    wb = load_workbook(output)
+    ws = wb['Result Data']
+    green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+    red_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+
+    for row in ws.iter_rows(min_row=2, min_col=3):
+        for cell in row:
+            if cell.value == "Data Available":
+                cell.fill = green_fill
+            elif cell.value == "Data Not Available":
+                cell.fill = red_fill
+
+    final_output = io.BytesIO()
+    wb.save(final_output)
+    return final_output.getvalue()
@@ -0,0 +1,91 @@
+# check_startup.py
+#
+# Cold-start budget check for the dashboard pages. Each page is rendered once
+# (no uploads) in a fresh interpreter through Streamlit's AppTest; the check
+# fails if the first render takes longer than the budget or if it pulls in a
+# dependency that should only load on first use.
+#
+#   python check_startup.py                 # all pages, default budget
+#   python check_startup.py --budget 1.5    # seconds per page
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PAGES = {
+    "router": "SCADA_app.py",
+    "bct": "app_pages/bct_availability.py",
+    "temperature": "app_pages/temperature_analysis.py",
+    "standalone-bct": "streamlit_app.py",
+}
+
+# Must not be imported before the user has uploaded anything.
+DEFERRED_MODULES = ['openpyxl', 'plotly', 'matplotlib', 'st_aggrid', 'chardet']
+
+DEFAULT_BUDGET = float(os.environ.get("SCADA_STARTUP_BUDGET", 2.0))
+
+
+def measure(script):
+    # Runs in the child process. Streamlit itself is imported before the clock
+    # starts: it is paid once per server, not per page.
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    before = set(sys.modules)
+    start = time.perf_counter()
+    at = AppTest.from_file(script, default_timeout=60)
+    at.run()
+    elapsed = time.perf_counter() - start
+    loaded = {name.split('.')[0] for name in set(sys.modules) - before}
+    return {
+        'seconds': elapsed,
+        'exceptions': [e.value for e in at.exception],
+        'deferred_loaded': sorted(m for m in DEFERRED_MODULES if m in loaded),
+        'modules': len(set(sys.modules) - before),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start budget check for the dashboard pages.")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help="seconds allowed per page")
+    parser.add_argument('--page', choices=sorted(PAGES), action='append', help="page(s) to check")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child)))
+        return 0
+
+    failed = False
+    for name in args.page or PAGES:
+        proc = subprocess.run(
+            [sys.executable, __file__, '--child', PAGES[name]],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if proc.returncode != 0:
+            print(f"{name:<15} ERROR\n{proc.stderr[-2000:]}")
+            failed = True
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        problems = []
+        if result['seconds'] > args.budget:
+            problems.append(f"over budget ({args.budget:.2f}s)")
+        if result['deferred_loaded']:
+            problems.append(f"eagerly imports {', '.join(result['deferred_loaded'])}")
+        if result['exceptions']:
+            problems.append(f"raised {result['exceptions']}")
+        failed = failed or bool(problems)
+        status = "FAIL " + "; ".join(problems) if problems else "ok"
+        print(f"{name:<15} {result['seconds']:6.2f}s  {result['modules']:5d} modules  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# fanout.py
+
+import multiprocessing
+import os
+import re
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+# === Settings ===
+FANOUT_WORKERS = int(os.environ.get("SCADA_FANOUT_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+
+
+# === Shared column store ===
+# The partitioned frame is written once as one .npy file per column and every
+# worker memory-maps only its own row range, instead of each task receiving a
+# pickled copy. Text columns are dictionary-encoded: int32 codes on disk, the
+# (small) list of distinct values travels with the layout.
+def share_frame(df, directory):
+    layout = {}
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        path = os.path.join(directory, f"col{i}.npy")
+        if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+            codes, categories = pd.factorize(series, use_na_sentinel=True)
+            np.save(path, codes.astype(np.int32))
+            layout[col] = (path, list(categories))
+        else:
+            np.save(path, series.to_numpy())
+            layout[col] = (path, None)
+    return layout
+
+
+def attach_frame(layout, start, stop):
+    data = {}
+    for col, (path, categories) in layout.items():
+        values = np.load(path, mmap_mode='r')[start:stop]
+        if categories is not None:
+            lookup = np.empty(len(categories) + 1, dtype=object)
+            lookup[:-1] = categories
+            lookup[-1] = None
+            values = lookup[values]  # code -1 (missing) picks the trailing None
+        data[col] = values
+    return pd.DataFrame(data)
+
+
+def safe_name(value):
+    return re.sub(r'[^\w.-]+', '_', str(value)).strip('_.') or 'site'
+
+
+def unique_names(sites):
+    # Distinct sites can clean to the same file name ('Site A' and 'Site_A',
+    # or two names made only of punctuation); number the repeats. Compared
+    # case-insensitively so the ZIP also extracts cleanly on Windows.
+    used = set()
+    names = []
+    for site in sites:
+        base = name = safe_name(site)
+        n = 1
+        while name.lower() in used:
+            n += 1
+            name = f"{base}_{n}"
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+# === Workers (run in child processes) ===
+# Each worker gets a file name unique within the ZIP and a directory of its own.
+def bct_site_worker(layout, start, stop, name, site_lookup, out_dir):
+    from availability import build_availability, build_availability_excel
+    compiled_df = attach_frame(layout, start, stop)
+    sheets = build_availability(compiled_df, site_lookup)
+    path = os.path.join(out_dir, f"data_availability_{name}.xlsx")
+    with open(path, 'wb') as f:
+        f.write(build_availability_excel(*sheets))
+    return path
+
+
+def temperature_site_worker(layout, start, stop, name, site_lookup, out_dir):
+    from temperature import analyse_temperature, create_excel
+    compiled_df = attach_frame(layout, start, stop)
+    filtered_df, max_df, result_df = analyse_temperature(compiled_df)
+    path = os.path.join(out_dir, f"temperature_report_{name}.xlsx")
+    with open(path, 'wb') as f:
+        f.write(create_excel(compiled_df, filtered_df, max_df, result_df).getvalue())
+    return path
+
+
+# === Fan-out ===
+def build_site_zip(compiled_df, lookup, worker, progress=None):
+    # Partition rows by the Site of their asset (from the master lookup), build
+    # one workbook per site in a process pool and add each workbook to the ZIP
+    # as soon as it is ready. Returns (zip bytes, sites without data rows).
+    row_sites = lookup.gather(lookup.encode(compiled_df['Asset Name']), ['Site'])['Site']
+    site_codes, sites = pd.factorize(row_sites, sort=True)
+
+    # Sorting by site makes each partition one contiguous row range.
+    keep = np.flatnonzero(site_codes >= 0)
+    order = keep[np.argsort(site_codes[keep], kind='stable')]
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(site_codes[order], minlength=len(sites)))])
+    missing_sites = sorted(set(lookup.frame['Site'].dropna()) - set(sites), key=str)
+
+    with tempfile.TemporaryDirectory(prefix="scada-fanout-") as tmp:
+        layout = share_frame(compiled_df.take(order), tmp)
+        zip_path = os.path.join(tmp, "site_reports.zip")
+        context = multiprocessing.get_context('spawn')
+        workers = min(FANOUT_WORKERS, max(1, len(sites)))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool, \
+                zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            futures = {}
+            for i, (site, name) in enumerate(zip(sites, unique_names(sites))):
+                out_dir = os.path.join(tmp, f"part{i}")
+                os.mkdir(out_dir)
+                future = pool.submit(
+                    worker, layout, int(bounds[i]), int(bounds[i + 1]), name,
+                    lookup.subset(lookup.frame['Site'] == site), out_dir
+                )
+                futures[future] = site
+            for done, future in enumerate(as_completed(futures), start=1):
+                path = future.result()
+                zf.write(path, arcname=os.path.basename(path))
+                os.remove(path)
+                if progress:
+                    progress(done / len(futures), f"Built {done} of {len(futures)} site workbooks")
+        with open(zip_path, 'rb') as f:
+            return f.read(), missing_sites
@@ -0,0 +1,88 @@
+# grids.py
+
+import math
+
+import streamlit as st
+
+# === Settings ===
+PAGE_SIZES = [50, 100, 250, 500]
+
+# Colouring is shipped to the browser as rules and evaluated by the grid for
+# the rendered cells only, instead of being baked into inline HTML.
+STATUS_RULES = {
+    'status-available': "x == 'Data Available'",
+    'status-missing': "x == 'Data Not Available'",
+}
+
+GRID_CSS = {
+    '.status-available': {'background-color': '#c6efce !important', 'color': '#006100 !important'},
+    '.status-missing': {'background-color': '#ffc7ce !important', 'color': '#9c0006 !important'},
+    '.over-limit': {'background-color': '#ffc7ce !important', 'color': '#9c0006 !important'},
+    '.ag-header': {'background-color': '#004d66 !important'},
+    '.ag-header-cell-text': {'color': 'white !important'},
+}
+
+
+def status_rules(columns):
+    return {col: STATUS_RULES for col in columns}
+
+
+def threshold_rules(thresholds):
+    return {col: {'over-limit': f"x > {limit}"} for col, limit in thresholds.items()}
+
+
+# === Paged grid ===
+def render_paged_grid(df, key, column_rules=None, pinned=0, height=450):
+    # Sorting and paging happen here on the server; only the visible page is
+    # serialised and sent to the browser, which virtualises rows and columns.
+    if df.empty:
+        st.info("No rows to display.")
+        return
+
+    # Imported here so pages only load the AgGrid component once a grid is shown.
+    from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
+
+    columns = list(df.columns)
+    c1, c2, c3, c4 = st.columns([3, 1, 1, 1])
+    with c1:
+        sort_col = st.selectbox("Sort by", ["(none)"] + columns, key=f"{key}_sort")
+    with c2:
+        descending = st.toggle("Descending", key=f"{key}_desc")
+    with c3:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_size")
+    total_pages = max(1, math.ceil(len(df) / page_size))
+    # The page lives only in session state (no value= on the widget), so it can
+    # be clamped when a larger page size leaves fewer pages.
+    page_key = f"{key}_page"
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), total_pages)
+    with c4:
+        page = st.number_input("Page", min_value=1, max_value=total_pages, step=1, key=page_key)
+
+    start = (page - 1) * page_size
+    stop = start + page_size
+    if sort_col != "(none)":
+        order = df[sort_col].sort_values(ascending=not descending, kind='stable', na_position='last').index
+        window = df.loc[order[start:stop]]
+    else:
+        window = df.iloc[start:stop].copy()
+
+    gb = GridOptionsBuilder.from_dataframe(window)
+    gb.configure_default_column(sortable=False, filter=False, resizable=True)
+    for col in columns[:pinned]:
+        gb.configure_column(col, pinned='left')
+    for col, rules in (column_rules or {}).items():
+        if col in columns:
+            gb.configure_column(col, cellClassRules=rules)
+    gb.configure_grid_options(suppressColumnVirtualisation=False, rowBuffer=10)
+
+    AgGrid(
+        window,
+        gridOptions=gb.build(),
+        height=height,
+        update_mode=GridUpdateMode.NO_UPDATE,
+        data_return_mode=DataReturnMode.AS_INPUT,
+        custom_css=GRID_CSS,
+        key=f"{key}_grid",
+        show_download_button=False,
+    )
+    st.caption(f"Rows {start + 1:,}–{min(stop, len(df)):,} of {len(df):,} · page {page} of {total_pages}")
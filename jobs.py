@@ -0,0 +1,181 @@
+# jobs.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+# === Settings ===
+MAX_WORKERS = int(os.environ.get("SCADA_JOB_WORKERS", 2))
+MAX_QUEUED = int(os.environ.get("SCADA_JOB_QUEUE", 8))
+MAX_RESULTS = int(os.environ.get("SCADA_JOB_RESULTS", 16))
+MAX_RESULT_MB = int(os.environ.get("SCADA_JOB_RESULTS_MB", 2048))
+POLL_SECONDS = 1.0
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+class Job:
+    def __init__(self, job_id, label):
+        self.id = job_id
+        self.label = label
+        self.status = 'queued'
+        self.progress = 0.0
+        self.message = "Waiting for a free worker..."
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+        self.nbytes = 0
+
+    @property
+    def done(self):
+        return self.status in ('done', 'failed')
+
+    def update(self, fraction, message=None):
+        self.progress = min(max(float(fraction), 0.0), 1.0)
+        if message:
+            self.message = message
+
+
+class JobRunner:
+    # One bounded worker pool per server process. Jobs are keyed by the content
+    # hash of their inputs, so resubmitting the same uploads (another session,
+    # or the same user after a reload) attaches to the existing job or result.
+    # Finished results are kept for reuse until there are more than max_results
+    # of them or they hold more than max_result_mb, oldest first.
+    def __init__(self, max_workers=MAX_WORKERS, max_queued=MAX_QUEUED, max_results=MAX_RESULTS,
+                 max_result_mb=MAX_RESULT_MB):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scada-job")
+        self._capacity = max_workers + max_queued
+        self._max_results = max_results
+        self._max_result_bytes = max_result_mb * 1024 * 1024
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, job_id, label, fn, *args, retry=False):
+        # A failed job stays attached (so its error can be shown) until it is
+        # resubmitted with retry=True.
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and not (retry and job.status == 'failed'):
+                self._jobs.move_to_end(job_id)
+                return job
+            active = sum(1 for j in self._jobs.values() if not j.done)
+            if active >= self._capacity:
+                raise JobQueueFull("The server is busy with other reports. Please try again in a few minutes.")
+            job = Job(job_id, label)
+            self._jobs[job_id] = job
+            self._evict()
+        self._pool.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job, fn, args):
+        job.status = 'running'
+        job.message = "Starting..."
+        try:
+            job.result = fn(job.update, *args)
+            job.nbytes = result_nbytes(job.result)
+            job.update(1.0, "Finished")
+            job.status = 'done'
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.status = 'failed'
+        finally:
+            job.finished = time.time()
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        # The newest result is never evicted, even when it alone is over budget:
+        # the session that submitted it is about to read it.
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        held = sum(self._jobs[job_id].nbytes for job_id in finished)
+        while finished[:-1] and (len(self._jobs) > self._max_results or held > self._max_result_bytes):
+            held -= self._jobs.pop(finished.pop(0)).nbytes
+
+
+def result_nbytes(value):
+    # Approximate memory held by a job result: frames, Excel bytes and the
+    # containers the jobs return them in.
+    if isinstance(value, dict):
+        return sum(result_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(result_nbytes(v) for v in value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if hasattr(value, 'getbuffer'):
+        return value.getbuffer().nbytes
+    if hasattr(value, 'frame'):
+        return result_nbytes(value.frame)
+    return 0
+
+
+@st.cache_resource
+def get_runner():
+    return JobRunner()
+
+
+def content_hash(kind, *signatures):
+    digest = hashlib.blake2b(digest_size=12)
+    for signature in signatures:
+        digest.update(repr(signature).encode('utf-8'))
+    return f"{kind}-{digest.hexdigest()}"
+
+
+# === UI helpers ===
+def retry_requested(job_id):
+    # True on the rerun triggered by the Retry button wait_for_job shows for a failed job.
+    return bool(st.session_state.get(f"{job_id}-retry"))
+
+
+def submit_job(param, job_id, label, fn, *args):
+    # The job id is mirrored into the URL so a page reload can reattach to it.
+    try:
+        job = get_runner().submit(job_id, label, fn, *args, retry=retry_requested(job_id))
+    except JobQueueFull as e:
+        st.warning(str(e))
+        return None
+    if param and st.query_params.get(param) != job_id:
+        st.query_params[param] = job_id
+    return job
+
+
+def resume_job(param):
+    job_id = st.query_params.get(param)
+    if not job_id:
+        return None
+    return get_runner().get(job_id)
+
+
+def wait_for_job(job):
+    # Returns the job once it has succeeded; until then shows a progress bar that
+    # polls on its own and triggers a full rerun when the job completes.
+    if job.status == 'done':
+        return job
+    if job.status == 'failed':
+        st.error(f"{job.label} failed: {job.error}")
+        st.button("🔁 Retry", key=f"{job.id}-retry")
+        return None
+
+    @st.fragment(run_every=POLL_SECONDS)
+    def _poll():
+        st.progress(job.progress, text=f"{job.label}: {job.message}")
+        if job.done:
+            st.rerun()
+
+    _poll()
+    return None
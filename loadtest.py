@@ -0,0 +1,303 @@
+# loadtest.py
+#
+# Local concurrent-session load test for the dashboards. Drives N headless app
+# sessions at once through Streamlit's in-process AppTest API: each session
+# uploads its own synthetic CSV/master files, waits for the background jobs,
+# changes filters and requests the Excel downloads. Every session-count level
+# runs in a fresh process so its peak RSS can be reported on its own.
+#
+#   python loadtest.py                          # 1, 2, 4 and 8 sessions
+#   python loadtest.py --sessions 1 4 16 --rows 50000 --page bct
+
+import argparse
+import io
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import zlib
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP = "SCADA_app.py"
+TEMPERATURE_PAGE = "app_pages/temperature_analysis.py"
+
+# AppTest installs a process-global mock Runtime for the duration of each run,
+# so script runs from different sessions cannot overlap in one process and are
+# serialised here. A real server runs every session's script in its own thread
+# (and pandas/numpy release the GIL), so this harness does not measure
+# script-vs-script contention. Reported latencies are the script run time
+# alone, which still includes contention with the background job and fan-out
+# pools; the time spent waiting for the lock is reported separately and is an
+# artefact of the harness, not a latency users would see.
+RUN_LOCK = threading.Lock()
+
+TEMP_COLUMNS = [
+    'Temperaturemeasurementforgeneratorbearingdriveend',
+    'Temperaturemeasurementforgeneratorbearingnondriveend',
+    'GearboxHighSpeedShaftDrivenEndtemp',
+    'GearboxHighSpeedShaftNonDrivenEndtemp',
+    'MeasuredTemperatureofrotorbearing',
+    'OilSumpTemp',
+]
+
+
+# === Synthetic uploads ===
+class SyntheticUpload(io.BytesIO):
+    # Quacks like streamlit's UploadedFile for everything the pages use.
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        self.file_id = f"{name}:{zlib.crc32(data):08x}"
+        self.type = 'text/csv' if name.endswith('.csv') else 'application/octet-stream'
+
+
+def make_master(assets, sites):
+    import pandas as pd
+    df = pd.DataFrame({
+        'Asset Name': [f"WTG{i:04d}" for i in range(assets)],
+        'Make': [f"Make{i % 3}" for i in range(assets)],
+        'Site': [f"Site{i % sites:02d}" for i in range(assets)],
+    })
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def make_bct_csv(rows, assets, seed):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(rows):
+        minutes = i * 10 // assets
+        day, minute = divmod(minutes, 24 * 60)
+        lines.append(
+            f"{day % 28 + 1:02d}-01-2025 {minute // 60:02d}:{minute % 60:02d}:00,"
+            f"WTG{rng.randrange(assets):04d},{rng.uniform(0, 2100):.1f},{rng.uniform(0, 20):.2f}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def make_temperature_csv(rows, assets, seed):
+    rng = random.Random(seed)
+    header = ['Date', 'Asset Name', 'ActivepowerGeneration'] + TEMP_COLUMNS
+    lines = [",".join(header)]
+    for i in range(rows):
+        minutes = i * 10 // assets
+        day, minute = divmod(minutes, 24 * 60)
+        values = [f"{rng.uniform(20, 100):.1f}" for _ in TEMP_COLUMNS]
+        lines.append(",".join([
+            f"{day % 28 + 1:02d}-01-2025 {minute // 60:02d}:{minute % 60:02d}:00",
+            f"WTG{rng.randrange(assets):04d}",
+            f"{rng.uniform(-50, 2100):.1f}",
+        ] + values))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def session_uploads(index, args):
+    # Each session gets distinct file contents so jobs are not deduplicated
+    # across sessions by their content hash.
+    seed = args.seed + index
+    csvs = [
+        (f"bct_{index}_{n}.csv", make_bct_csv(args.rows, args.assets, seed * 100 + n))
+        for n in range(args.files)
+    ]
+    temps = [
+        (f"temp_{index}_{n}.csv", make_temperature_csv(args.rows, args.assets, seed * 100 + n))
+        for n in range(args.files)
+    ]
+    master = (f"master_{index}.xlsx", make_master(args.assets, args.sites))
+    return {
+        "Upload Master Excel File": master,
+        "Upload CSV Files": csvs,
+        "Upload CSV files": temps,
+    }
+
+
+def install_fake_uploader():
+    # AppTest cannot drive st.file_uploader, so uploads come from session state.
+    import streamlit as st
+
+    def file_uploader(label, *args, accept_multiple_files=False, **kwargs):
+        files = st.session_state.get("loadtest_uploads", {}).get(label)
+        if not files:
+            return [] if accept_multiple_files else None
+        if accept_multiple_files:
+            return [SyntheticUpload(name, data) for name, data in files]
+        return SyntheticUpload(*files)
+
+    st.file_uploader = file_uploader
+
+
+# === One session ===
+class Session:
+    def __init__(self, index, uploads, args):
+        self.index = index
+        self.uploads = uploads
+        self.args = args
+        self.run_times = []
+        self.lock_waits = []  # harness only, see RUN_LOCK
+        self.errors = []
+        self.rejected = False
+        self.downloads = 0
+
+    def run(self, at):
+        start = time.perf_counter()
+        with RUN_LOCK:
+            began = time.perf_counter()
+            at.run()
+        end = time.perf_counter()
+        self.lock_waits.append(began - start)
+        self.run_times.append(end - began)
+        self.errors.extend(str(e.value) for e in at.exception)
+        if any("server is busy" in str(w.value) for w in at.warning):
+            self.rejected = True
+        return at
+
+    def settle(self, at):
+        # Rerun until no job progress bar is left on the page.
+        deadline = time.monotonic() + self.args.timeout
+        while at.get("progress") and time.monotonic() < deadline:
+            time.sleep(self.args.poll)
+            self.run(at)
+        if at.get("progress"):
+            self.errors.append("timed out waiting for a job")
+        return at
+
+    def click(self, at, text):
+        for button in at.button:
+            if text in button.label:
+                button.click()
+                return self.settle(self.run(at))
+        return at
+
+    def scenario(self):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(APP, default_timeout=self.args.timeout)
+        at.session_state["loadtest_uploads"] = self.uploads
+
+        if self.args.page in ('bct', 'both'):
+            self.settle(self.run(at))
+            if at.selectbox:
+                at.selectbox(key="result_data_sort").set_value("Site")
+                self.run(at)
+            self.click(at, "Prepare Excel File")
+            self.downloads += len(at.get("download_button"))
+
+        if self.args.page in ('temperature', 'both'):
+            if self.args.page == 'temperature':
+                self.run(at)
+            at.switch_page(TEMPERATURE_PAGE)
+            self.settle(self.run(at))
+            if at.multiselect:
+                assets = at.multiselect[0].options
+                at.multiselect[0].set_value(assets[: max(1, len(assets) // 2)])
+                self.settle(self.run(at))
+            self.click(at, "Prepare Excel Report")
+            self.downloads += len(at.get("download_button"))
+
+
+# === One level (child process) ===
+def percentile(values, q):
+    if not values:
+        return None
+    return statistics.median(values) if q == 0.5 else values[int(q * (len(values) - 1))]
+
+
+def run_level(sessions, args):
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    install_fake_uploader()
+
+    prepared = [Session(i, session_uploads(i, args), args) for i in range(sessions)]
+
+    def worker(session):
+        try:
+            session.scenario()
+        except Exception as e:
+            session.errors.append(f"{type(e).__name__}: {e}")
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(s,)) for s in prepared]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    run_times = sorted(t for s in prepared for t in s.run_times)
+    lock_waits = sorted(t for s in prepared for t in s.lock_waits)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # kilobytes on Linux
+    return {
+        'sessions': sessions,
+        'reruns': len(run_times),
+        'p50': percentile(run_times, 0.50),
+        'p95': percentile(run_times, 0.95),
+        'max': run_times[-1] if run_times else None,
+        'wait_p50': percentile(lock_waits, 0.50),
+        'wait_p95': percentile(lock_waits, 0.95),
+        'wall': wall,
+        'peak_rss_mb': peak_kb / 1024,
+        'downloads': sum(s.downloads for s in prepared),
+        'rejected': sum(s.rejected for s in prepared),
+        'errors': [e for s in prepared for e in s.errors][:5],
+    }
+
+
+# === Driver ===
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the dashboards.")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8], help="session counts to test")
+    parser.add_argument('--page', choices=['bct', 'temperature', 'both'], default='both')
+    parser.add_argument('--rows', type=int, default=20000, help="rows per synthetic CSV")
+    parser.add_argument('--files', type=int, default=1, help="CSV files per session")
+    parser.add_argument('--assets', type=int, default=50)
+    parser.add_argument('--sites', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=300, help="seconds to wait for a job")
+    parser.add_argument('--poll', type=float, default=0.2, help="seconds between polling reruns")
+    parser.add_argument('--json', action='store_true', help="print raw results as JSON lines")
+    parser.add_argument('--level', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.level:
+        print(json.dumps(run_level(args.level, args)))
+        return 0
+
+    passthrough = [a for a in sys.argv[1:] if a != '--json']
+    failed = False
+    if not args.json:
+        # p50/p95/max: script run time. wait: time queued on the harness lock.
+        print(f"{'sessions':>8} {'reruns':>7} {'p50 s':>7} {'p95 s':>7} {'max s':>7} {'wait p50':>8} "
+              f"{'wait p95':>8} {'wall s':>7} {'peak MB':>8} {'downloads':>9} {'rejected':>8}")
+    for level in args.sessions:
+        proc = subprocess.run(
+            [sys.executable, __file__, '--level', str(level)] + passthrough,
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if proc.returncode != 0:
+            print(f"{level:>8} ERROR\n{proc.stderr[-2000:]}")
+            failed = True
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(f"{result['sessions']:>8} {result['reruns']:>7} {result['p50'] or 0:>7.2f} "
+                  f"{result['p95'] or 0:>7.2f} {result['max'] or 0:>7.2f} "
+                  f"{result['wait_p50'] or 0:>8.2f} {result['wait_p95'] or 0:>8.2f} {result['wall']:>7.1f} "
+                  f"{result['peak_rss_mb']:>8.0f} {result['downloads']:>9} {result['rejected']:>8}")
+            for error in result['errors']:
+                print(f"{'':>8} ! {error}")
+        failed = failed or bool(result['errors'])
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# master_lookup.py
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from sniffing import content_digest
+
+
+class MasterLookup:
+    # The asset register as an index of asset names plus one array per
+    # attribute column. Rows are joined by position: asset names are
+    # dictionary-encoded to integer codes once, and enrichment is an array
+    # gather instead of a string hash merge.
+    def __init__(self, master_df):
+        # Assets listed more than once keep their first row; the repeats (and
+        # which of them disagree on Make/Site/...) are kept for the UI to report.
+        names = master_df['Asset Name']
+        repeated = master_df[names.notna() & names.duplicated(keep=False)]
+        self.duplicates = sorted(pd.unique(repeated['Asset Name']).tolist(), key=str)
+        attributes = [col for col in master_df.columns if col != 'Asset Name']
+        if attributes and not repeated.empty:
+            differs = repeated.groupby('Asset Name')[attributes].nunique(dropna=False).gt(1).any(axis=1)
+            self.conflicts = sorted(differs[differs].index.tolist(), key=str)
+        else:
+            self.conflicts = []
+
+        master_df = master_df.drop_duplicates('Asset Name').reset_index(drop=True)
+        self.frame = master_df
+        self.assets = pd.Index(master_df['Asset Name'])
+        self.columns = [col for col in master_df.columns if col != 'Asset Name']
+        # One trailing missing-value slot so code -1 (unmatched) gathers to NaN.
+        self._values = {
+            col: np.append(master_df[col].to_numpy(dtype=object), np.nan) for col in self.columns
+        }
+
+    def __len__(self):
+        return len(self.assets)
+
+    def encode(self, asset_names):
+        # Hash each distinct name once, then broadcast the codes to every row.
+        row_codes, uniques = pd.factorize(asset_names, use_na_sentinel=True)
+        unique_codes = np.append(self.assets.get_indexer(uniques), -1)
+        return unique_codes[row_codes]
+
+    def gather(self, codes, columns=None):
+        return pd.DataFrame({col: self._values[col][codes] for col in (columns or self.columns)})
+
+    def enrich(self, df, codes, columns=None):
+        gathered = self.gather(codes, columns)
+        gathered.index = df.index
+        return pd.concat([df, gathered], axis=1)
+
+    def unmatched(self, asset_names, codes):
+        names = np.asarray(asset_names, dtype=object)
+        missing = names[(codes < 0) & pd.notna(names)]
+        return sorted(pd.unique(missing).tolist(), key=str)
+
+    def subset(self, mask):
+        return MasterLookup(self.frame[mask])
+
+
+# === Loading ===
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_lookup(file_hash, _master_file):
+    master_df = pd.read_excel(_master_file, engine='openpyxl')
+    master_df.columns = [str(col).strip().title() for col in master_df.columns]
+    if 'Asset Name' not in master_df.columns:
+        raise ValueError("Master Excel file must contain an 'Asset Name' column.")
+    return MasterLookup(master_df)
+
+
+def load_master_lookup(master_file):
+    # Parsed once per distinct file content for the whole server; the cached
+    # lookup is shared between sessions and must be treated as read-only.
+    file_hash = content_digest(master_file)
+    master_file.seek(0)
+    return _load_lookup(file_hash, master_file)
+
+
+def describe_duplicates(lookup, limit=10):
+    if not lookup.duplicates:
+        return None
+    conflicts = set(lookup.conflicts)
+    shown = ', '.join(
+        f"{name} (conflicting rows)" if name in conflicts else str(name)
+        for name in lookup.duplicates[:limit]
+    )
+    more = f" and {len(lookup.duplicates) - limit} more" if len(lookup.duplicates) > limit else ""
+    return (f"{len(lookup.duplicates)} asset(s) listed more than once in the master file; "
+            f"the first row of each is used: {shown}{more}")
+
+
+def describe_unmatched(unmatched, limit=10):
+    shown = ', '.join(map(str, unmatched[:limit]))
+    more = f" and {len(unmatched) - limit} more" if len(unmatched) > limit else ""
+    return f"{len(unmatched)} asset(s) not found in the master file: {shown}{more}"
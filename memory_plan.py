@@ -0,0 +1,231 @@
+# memory_plan.py
+
+import io
+import os
+import threading
+
+import streamlit as st
+
+from sniffing import decode_sample, read_sample, read_sniffed_csv, sniff_csv, source_signature
+
+# === Settings ===
+SESSION_BUDGET_MB = int(os.environ.get("SCADA_SESSION_MEMORY_MB", 1024))
+CHUNK_ROWS = int(os.environ.get("SCADA_CHUNK_ROWS", 200_000))
+MIN_CHUNK_ROWS = 10_000
+IN_MEMORY_OVERHEAD = 3.0  # per-file frames + concat copy + derived frames (filtered, enriched)
+CHUNK_OVERHEAD = 4.0      # parser buffers + prepared chunk + per-chunk groupby
+AGGREGATE_OVERHEAD = 2.0  # partial aggregates + the combined result
+EXPORT_CELL_BYTES = 300   # openpyxl keeps every cell as an object until the workbook is saved
+EXCEL_MAX_ROWS = 1_048_575  # data rows per sheet, below the header
+MB = 1024 * 1024
+
+
+class MemoryPlan:
+    # How a set of uploads will be processed: 'in_memory' (load everything, as
+    # before), 'chunked' (stream chunk_rows rows at a time into aggregates) or
+    # 'refuse' (neither fits). Each need covers loading, the frames the run
+    # produces and the Excel export built from them. reason says why the rows
+    # are not processed in memory and chunked_reason why a chunked run is
+    # refused: 'budget' (over the per-session budget) or 'excel_rows' (more
+    # rows than an Excel sheet holds).
+    def __init__(self, mode, rows, decoded_bytes, budget_bytes, in_memory_need, chunked_need=None,
+                 aggregate_rows=None, chunk_rows=None, reason=None, chunked_reason=None):
+        self.mode = mode
+        self.rows = rows
+        self.decoded_bytes = decoded_bytes
+        self.budget_bytes = budget_bytes
+        self.in_memory_need = in_memory_need
+        self.chunked_need = chunked_need
+        self.aggregate_rows = aggregate_rows
+        self.chunk_rows = chunk_rows
+        self.reason = reason
+        self.chunked_reason = chunked_reason
+
+    @property
+    def peak_bytes(self):
+        return self.chunked_need if self.mode == 'chunked' else self.in_memory_need
+
+    @property
+    def message(self):
+        budget = f"{self.budget_bytes / MB:,.0f} MB"
+        if self.mode == 'in_memory':
+            return (f"Processing in memory: about {self.in_memory_need / MB:,.0f} MB (~{self.rows:,} rows) "
+                    f"to load and export at once, within the {budget} per-session budget.")
+
+        if self.reason == 'excel_rows':
+            whole = f"have ~{self.rows:,} rows, more than an Excel sheet holds ({EXCEL_MAX_ROWS:,})"
+        else:
+            whole = (f"need about {self.in_memory_need / MB:,.0f} MB (~{self.rows:,} rows) to load and "
+                     f"export at once, more than the {budget} per-session memory budget")
+        if self.mode == 'chunked':
+            return f"These uploads {whole}, so they are processed in chunks of {self.chunk_rows:,} rows."
+
+        if self.chunked_reason == 'excel_rows':
+            streamed = f"their results (~{self.aggregate_rows:,} rows) are more than an Excel sheet holds"
+            advice = "Upload fewer or shorter files."
+        else:
+            if self.aggregate_rows:
+                streamed = (f"their results (~{self.aggregate_rows:,} rows) and export need about "
+                            f"{self.chunked_need / MB:,.0f} MB")
+            else:
+                streamed = f"they need about {self.chunked_need / MB:,.0f} MB"
+            advice = "Upload fewer or smaller files, or raise SCADA_SESSION_MEMORY_MB."
+        return f"These uploads {whole}, and even streamed in chunks {streamed}. {advice}"
+
+
+# === Estimation ===
+@st.cache_data(show_spinner=False, max_entries=512)
+def _estimate(signature, kind, time_column, _file, _sniff, _prepare, _read_kwargs):
+    # Parse the leading sample exactly as the loader would (same sniffed
+    # dialect, same column preparation), then scale its decoded size per row by
+    # the number of rows the file size implies. Also returns the column count
+    # and the median sampling interval per asset (seconds), which sizes the
+    # bucketed aggregates of a chunked run.
+    # The sample is cut after its last complete line in the sniffed encoding
+    # (a raw b'\n' search would split UTF-16 code units).
+    text = decode_sample(read_sample(_file), _sniff['encoding'])
+    if not text:
+        return 0, 0, 0, None
+    sample = text.encode(_sniff['encoding'], errors='replace')
+    df = _prepare(read_sniffed_csv(io.BytesIO(sample), _sniff, **_read_kwargs), _sniff)
+    if df.empty:
+        return 0, 0, 0, None
+    size = getattr(_file, 'size', None) or len(_file.getbuffer())
+    rows = int(size * max(text.count('\n'), 1) / len(sample))
+    row_bytes = df.memory_usage(deep=True, index=False).sum() / len(df)
+
+    step = None
+    if time_column in df.columns and 'Asset Name' in df.columns:
+        times = df[['Asset Name', time_column]].dropna().sort_values(['Asset Name', time_column])
+        gaps = times.groupby('Asset Name')[time_column].diff().dt.total_seconds()
+        gaps = gaps[gaps > 0]
+        if not gaps.empty:
+            step = float(gaps.median())
+    return rows, int(rows * row_bytes), len(df.columns), step
+
+
+def plan_memory(files, kind, prepare, sniff_kwargs, read_kwargs=None, time_column=None,
+                bucket_seconds=None, export_copies=1, export_columns=0, resident_bytes=0):
+    # bucket_seconds: time grain of the chunked aggregates (rows per asset per
+    # bucket collapse to one); None when a chunked run keeps no aggregates of
+    # its own. export_copies/export_columns: how many sheets repeat the rows
+    # and how many columns the export adds. resident_bytes: frames the run
+    # holds whatever the mode (e.g. the temperature frame being aligned). The
+    # Excel row limit only applies to rows that are exported (export_copies).
+    rows = decoded = columns = 0
+    steps = []
+    for file in files:
+        try:
+            sniff = sniff_csv(file, **sniff_kwargs)
+            file_rows, file_bytes, file_columns, step = _estimate(
+                source_signature(file), kind, time_column, file, sniff, prepare, read_kwargs or {}
+            )
+        except Exception:
+            continue  # unreadable files are reported by the loader itself
+        rows += file_rows
+        decoded += file_bytes
+        columns = max(columns, file_columns)
+        if step:
+            steps.append(step)
+
+    budget = SESSION_BUDGET_MB * MB
+    row_bytes = decoded / rows if rows else 0
+    cell_columns = columns + export_columns
+
+    def export_bytes(export_rows):
+        return export_rows * export_copies * cell_columns * EXPORT_CELL_BYTES
+
+    def over_excel(export_rows):
+        return export_copies > 0 and export_rows > EXCEL_MAX_ROWS
+
+    in_memory_need = decoded * IN_MEMORY_OVERHEAD + export_bytes(rows) + resident_bytes
+    if in_memory_need > budget:
+        reason = 'budget'
+    elif over_excel(rows):
+        reason = 'excel_rows'
+    else:
+        return MemoryPlan('in_memory', rows, decoded, budget, in_memory_need)
+
+    # Without a measurable interval assume no reduction at all (one row per bucket).
+    if bucket_seconds:
+        rows_per_bucket = max(1.0, bucket_seconds / min(steps)) if steps else 1.0
+        aggregate_rows = int(rows / rows_per_bucket) + 1
+    else:
+        aggregate_rows = 0
+    fixed = aggregate_rows * row_bytes * AGGREGATE_OVERHEAD + export_bytes(aggregate_rows) + resident_bytes
+    chunk_rows = min(CHUNK_ROWS, int((budget - fixed) / (row_bytes * CHUNK_OVERHEAD))) if row_bytes else CHUNK_ROWS
+    chunk_rows = max(chunk_rows, MIN_CHUNK_ROWS)
+    chunked_need = fixed + chunk_rows * row_bytes * CHUNK_OVERHEAD
+    if over_excel(aggregate_rows):
+        chunked_reason = 'excel_rows'
+    elif chunked_need > budget:
+        chunked_reason = 'budget'
+    else:
+        return MemoryPlan('chunked', rows, decoded, budget, in_memory_need, chunked_need,
+                          aggregate_rows, chunk_rows, reason)
+    return MemoryPlan('refuse', rows, decoded, budget, in_memory_need, chunked_need,
+                      aggregate_rows, reason=reason, chunked_reason=chunked_reason)
+
+
+# === Measurement ===
+def current_rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class PeakMemory:
+    # Samples the process RSS in a background thread while the block runs. RSS
+    # is process-wide, so work from other sessions running at the same time is
+    # included: the figure is an upper bound for this run.
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.start = None
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.start = self.peak = current_rss()
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._watch, daemon=True, name="scada-rss")
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._sample()
+        return False
+
+
+def usage_report(plan, meter, *frames):
+    retained = sum(int(df.memory_usage(deep=True).sum()) for df in frames if df is not None)
+    return {'plan': plan, 'start': meter.start, 'peak': meter.peak, 'retained': retained}
+
+
+def describe_usage(report):
+    plan = report['plan']
+    parts = [
+        f"Memory plan: {plan.mode.replace('_', '-')} (≈{plan.rows:,} rows, "
+        f"≈{plan.decoded_bytes / MB:,.0f} MB decoded, budget {plan.budget_bytes / MB:,.0f} MB)"
+    ]
+    if report['peak'] is not None:
+        parts.append(
+            f"peak RSS {report['peak'] / MB:,.0f} MB "
+            f"(+{(report['peak'] - report['start']) / MB:,.0f} MB during the run)"
+        )
+    parts.append(f"results hold {report['retained'] / MB:,.1f} MB")
+    return " · ".join(parts)
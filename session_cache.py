@@ -0,0 +1,39 @@
+# session_cache.py
+
+import streamlit as st
+
+from sniffing import content_digest
+
+
+def memoize_in_session(name, key, compute):
+    # Keep one result per slot in session state and only recompute when its
+    # key (usually the upload signatures) changes. Unlike st.cache_data the
+    # result is not copied on every rerun, so large frames cost nothing to reuse.
+    slot = st.session_state.get(name)
+    if slot is not None and slot[0] == key:
+        return slot[1]
+    value = compute()
+    if value is not None:
+        st.session_state[name] = (key, value)
+    return value
+
+
+def upload_signatures(files):
+    # Name + size + digest of the full content, so uploads that differ anywhere
+    # get different job ids and memo keys. Each upload (file_id) is hashed once
+    # per session rather than on every rerun.
+    if files is None:
+        return ()
+    if not isinstance(files, (list, tuple)):
+        files = [files]
+    digests = st.session_state.setdefault("_upload_digests", {})
+    signatures = []
+    for f in files:
+        file_id = getattr(f, 'file_id', None)
+        digest = digests.get(file_id) if file_id else None
+        if digest is None:
+            digest = content_digest(f)
+            if file_id:
+                digests[file_id] = digest
+        signatures.append(f"{getattr(f, 'name', 'upload')}:{getattr(f, 'size', '')}:{digest}")
+    return tuple(signatures)
@@ -0,0 +1,38 @@
+# site_reports.py
+
+from datetime import datetime
+
+import streamlit as st
+
+from fanout import build_site_zip
+from jobs import get_runner, retry_requested, submit_job, wait_for_job
+
+
+# === Jobs ===
+def run_site_fanout(progress, compiled_df, lookup, worker):
+    return build_site_zip(compiled_df, lookup, worker, progress)
+
+
+# === UI ===
+def site_fanout_section(fanout_job_id, compiled_df, lookup, worker, file_prefix):
+    zip_job = get_runner().get(fanout_job_id)
+    if zip_job is None and not st.button("🗜 Build Per-Site Workbooks (ZIP)", key=f"{file_prefix}_fanout"):
+        return
+    if zip_job is None or retry_requested(fanout_job_id):
+        zip_job = submit_job(
+            None, fanout_job_id, "Per-site workbooks", run_site_fanout, compiled_df, lookup, worker
+        )
+        if zip_job is None:
+            return
+    if not wait_for_job(zip_job):
+        return
+    zip_bytes, missing_sites = zip_job.result
+    if missing_sites:
+        st.info(f"No data rows for sites: {', '.join(map(str, missing_sites))}")
+    st.download_button(
+        label="📦 Download Per-Site Workbooks",
+        data=zip_bytes,
+        file_name=f"{file_prefix}_by_site_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+        mime="application/zip",
+        on_click="ignore"
+    )
@@ -0,0 +1,243 @@
+# sniffing.py
+
+import codecs
+import csv
+import hashlib
+import io
+
+import pandas as pd
+import streamlit as st
+
+# === Settings ===
+SNIFF_BYTES = 64 * 1024
+SNIFF_ROWS = 200
+CHECK_BYTES = 1024 * 1024
+DELIMITERS = ',;\t|'
+FALLBACK_ENCODING = 'cp1252'  # "ANSI" exports from Windows SCADA clients
+
+BCT_COLUMNS = ['Timestamp', 'Asset Name', 'Active Power', 'Wind Speed']
+
+TIMESTAMP_FORMATS = [
+    '%d-%m-%Y %H:%M:%S',
+    '%d-%m-%Y %H:%M',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%d.%m.%Y %H:%M:%S',
+    '%d.%m.%Y %H:%M',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y/%m/%d %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+]
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+# === Source signature ===
+def read_sample(file, size=SNIFF_BYTES):
+    # Uploads are BytesIO objects: slice the buffer instead of seeking, so the
+    # sample never moves the read position under a job parsing the same file.
+    if hasattr(file, 'getbuffer'):
+        with file.getbuffer() as buffer:
+            return bytes(buffer[:size])
+    file.seek(0)
+    sample = file.read(size)
+    file.seek(0)
+    return sample
+
+
+def content_digest(file):
+    # Hash of the whole upload. Use this wherever a result is shared or reused
+    # by key (job ids, parsed master files); the sample-based signature below
+    # only keys the sniff and size-estimate caches.
+    if hasattr(file, 'getbuffer'):
+        with file.getbuffer() as buffer:
+            return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+    file.seek(0)
+    digest = hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+    file.seek(0)
+    return digest
+
+
+def source_signature(file, sample=None):
+    # Name + size + hash of the leading bytes: cheap to compute on every rerun
+    # and stable for the same upload, without hashing the whole file. Two files
+    # that differ only past the sample share a signature.
+    if sample is None:
+        sample = read_sample(file)
+    size = getattr(file, 'size', None)
+    if size is None:
+        size = len(file.getbuffer())
+    digest = hashlib.blake2b(sample, digest_size=16).hexdigest()
+    return f"{getattr(file, 'name', 'upload')}:{size}:{digest}"
+
+
+# === Detection steps ===
+def detect_encoding(sample):
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    # UTF-16 without a BOM is valid UTF-8 byte for byte (NUL is ASCII), but
+    # mostly-ASCII text leaves a NUL in every other byte.
+    even, odd = sample[0::2], sample[1::2]
+    if len(sample) >= 4:
+        if odd.count(0) > 0.3 * len(odd) and even.count(0) < 0.05 * len(even):
+            return 'utf-16-le'
+        if even.count(0) > 0.3 * len(even) and odd.count(0) < 0.05 * len(odd):
+            return 'utf-16-be'
+
+    # The sample may cut a multi-byte character in half, so decode incrementally.
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    import chardet  # only needed for non-UTF exports
+    guess = chardet.detect(sample)
+    encoding = guess.get('encoding')
+    if encoding and guess.get('confidence', 0) >= 0.5:
+        return encoding.lower()
+    return FALLBACK_ENCODING
+
+
+def decode_sample(sample, encoding):
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=False)
+    # Drop the trailing partial line so the sniffer only sees complete rows.
+    if len(sample) >= SNIFF_BYTES and '\n' in text:
+        text = text[:text.rindex('\n') + 1]
+    return text
+
+
+def detect_delimiter(text):
+    try:
+        return csv.Sniffer().sniff(text, delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        return ','
+
+
+def detect_header(rows, expected_columns=None):
+    if not rows:
+        return False
+    first = [cell.strip() for cell in rows[0]]
+    if expected_columns and any(col in first for col in expected_columns):
+        return True
+    # A first row whose leading cell is already a timestamp is data, not a header.
+    if first and not pd.isna(pd.to_datetime(first[0], dayfirst=True, errors='coerce')):
+        return False
+    return all(not _is_number(cell) for cell in first if cell)
+
+
+def detect_timestamp_format(values):
+    values = pd.Series([v.strip() for v in values if v and v.strip()], dtype=object)
+    if values.empty:
+        return None
+    best_format, best_hits = None, 0
+    for fmt in TIMESTAMP_FORMATS:
+        hits = pd.to_datetime(values, format=fmt, errors='coerce').notna().sum()
+        if hits > best_hits:
+            best_format, best_hits = fmt, hits
+    if best_hits < len(values) * 0.9:
+        return None
+    return best_format
+
+
+def _is_number(value):
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+# === Sniffing ===
+@st.cache_data(show_spinner=False, max_entries=512)
+def _sniff(signature, _sample, expected_columns, timestamp_column):
+    encoding = detect_encoding(_sample)
+    text = decode_sample(_sample, encoding)
+    delimiter = detect_delimiter(text)
+    rows = [row for row in csv.reader(io.StringIO(text), delimiter=delimiter) if row][:SNIFF_ROWS]
+    header = detect_header(rows, expected_columns)
+
+    # timestamp_column is a column name for headed files, or a position for headerless ones.
+    timestamp_format = None
+    if rows:
+        if header and isinstance(timestamp_column, str):
+            names = [cell.strip() for cell in rows[0]]
+            position = names.index(timestamp_column) if timestamp_column in names else None
+        elif isinstance(timestamp_column, int):
+            position = timestamp_column
+        else:
+            position = None
+        if position is not None:
+            body = rows[1:] if header else rows
+            timestamp_format = detect_timestamp_format([row[position] for row in body if len(row) > position])
+
+    return {
+        'encoding': encoding,
+        'delimiter': delimiter,
+        'header': header,
+        'timestamp_format': timestamp_format,
+    }
+
+
+def sniff_csv(file, expected_columns=None, timestamp_column=None):
+    sample = read_sample(file)
+    expected = tuple(expected_columns) if expected_columns else None
+    return _sniff(source_signature(file, sample), sample, expected, timestamp_column)
+
+
+# === Reading ===
+def encoding_holds(file, encoding):
+    # The encoding was detected from the leading sample only. Decode the whole
+    # buffer strictly, block by block, to confirm it before parsing; nothing
+    # decoded is kept.
+    if not hasattr(file, 'getbuffer'):
+        return True
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        with file.getbuffer() as buffer:
+            for start in range(0, len(buffer), CHECK_BYTES):
+                decoder.decode(buffer[start:start + CHECK_BYTES], final=False)
+        decoder.decode(b'', final=True)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def read_sniffed_csv(file, sniff, names=None, notes=None, **kwargs):
+    # The parser decodes straight from the upload buffer; no decoded copy of the
+    # file is ever materialised in Python. Bytes that are invalid in the sniffed
+    # encoding further into the file switch the read to FALLBACK_ENCODING, and
+    # the file is named in notes instead of being garbled silently.
+    encoding, errors = sniff['encoding'], 'strict'
+    if not encoding_holds(file, encoding):
+        if notes is not None:
+            notes.append(
+                f"{getattr(file, 'name', 'upload')}: not valid {encoding} beyond the first "
+                f"{SNIFF_BYTES // 1024} KB; read as {FALLBACK_ENCODING} instead."
+            )
+        encoding, errors = FALLBACK_ENCODING, 'replace'
+    file.seek(0)
+    return pd.read_csv(
+        file,
+        sep=sniff['delimiter'],
+        encoding=encoding,
+        encoding_errors=errors,
+        header=0 if sniff['header'] else None,
+        names=names,
+        **kwargs,
+    )
+
+
+def parse_timestamps(series, sniff, dayfirst=True):
+    if sniff.get('timestamp_format'):
+        return pd.to_datetime(series, format=sniff['timestamp_format'], errors='coerce')
+    return pd.to_datetime(series, dayfirst=dayfirst, errors='coerce')
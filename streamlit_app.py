@@ -1,11 +1,12 @@
 # streamlit_app.py
 
 import streamlit as st
-import pandas as pd
-import io
 from datetime import datetime
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
+
+from availability import load_bct_data, build_availability, build_availability_excel
+from grids import render_paged_grid, status_rules
+from master_lookup import load_master_lookup, describe_duplicates, describe_unmatched
+from session_cache import memoize_in_session, upload_signatures
 
 # --- PAGE CONFIG ---
 st.set_page_config(
@@ -75,106 +76,70 @@ with col2:
 if master_file and uploaded_csvs:
     st.success("✅ Files uploaded successfully!")
 
-    # --- READ MASTER FILE ---
-    master_df = pd.read_excel(master_file, engine='openpyxl')
-    master_df.columns = [col.strip().title() for col in master_df.columns]
-
-    # --- READ CSV FILES ---
-    all_data = []
-    for file in uploaded_csvs:
-        try:
-            df = pd.read_csv(file, header=None, names=['Timestamp', 'Asset Name', 'Active Power', 'Wind Speed'], on_bad_lines='skip')
-            df['Timestamp'] = pd.to_datetime(df['Timestamp'], dayfirst=True, errors='coerce')
-            df['Date'] = df['Timestamp'].dt.date
-            df = df.dropna(subset=['Timestamp', 'Asset Name'])
-            all_data.append(df[['Timestamp', 'Date', 'Asset Name', 'Active Power']])
-        except Exception as e:
-            st.error(f"Error reading {file.name}: {e}")
-
-    compiled_df = pd.concat(all_data, ignore_index=True)
-
-    # === SHEET 1 ===
-    sheet1 = compiled_df.merge(master_df, on='Asset Name', how='left')
-
-    # === SHEET 2 ===
-    sheet2_counts = compiled_df.groupby(['Asset Name', 'Date']).size().reset_index(name='Count')
-    sheet2 = sheet2_counts.merge(master_df, on='Asset Name', how='left')
-    sheet2 = sheet2.groupby(['Make', 'Site', 'Date'])['Count'].sum().reset_index()
-    sheet2_pivot = sheet2.pivot(index=['Make', 'Site'], columns='Date', values='Count').fillna(0).astype(int)
-    sheet2_pivot.columns = [col.strftime('%d-%m-%Y') for col in sheet2_pivot.columns]
-    sheet2_pivot.reset_index(inplace=True)
-
-    # === SHEET 3 ===
-    status_rows = []
-    all_dates = sorted(compiled_df['Date'].dropna().unique())
-    for (make, site), group in master_df.groupby(['Make', 'Site']):
-        assets = group['Asset Name'].tolist()
-        for date in all_dates:
-            date_data = compiled_df[(compiled_df['Asset Name'].isin(assets)) & (compiled_df['Date'] == date)]
-            asset_counts = date_data.groupby('Asset Name').size()
-            total_assets = len(assets)
-            avg = asset_counts.sum() / total_assets if total_assets > 0 else 0
-            status = "Data Available" if avg >= 130 else "Data Not Available"
-            status_rows.append({'Make': make, 'Site': site, 'Date': date, 'Status': status})
-
-    sheet3 = pd.DataFrame(status_rows)
-    sheet3_pivot = sheet3.pivot(index=['Make', 'Site'], columns='Date', values='Status')
-    sheet3_pivot.columns = [col.strftime('%d-%m-%Y') for col in sheet3_pivot.columns]
-    sheet3_pivot.reset_index(inplace=True)
-
-    # === EXPORT TO EXCEL ===
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        sheet1.to_excel(writer, index=False, sheet_name='Compiled Data')
-        sheet2_pivot.to_excel(writer, index=False, sheet_name='Compiled Summary')
-        sheet3_pivot.to_excel(writer, index=False, sheet_name='Result Data')
-
-    # === COLOR SHEET 3 (EXCEL) ===
-    output.seek(0)
-    wb = load_workbook(output)
-    ws = wb['Result Data']
-    green_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    red_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-
-    for row in ws.iter_rows(min_row=2, min_col=3):
-        for cell in row:
-            if cell.value == "Data Available":
-                cell.fill = green_fill
-            elif cell.value == "Data Not Available":
-                cell.fill = red_fill
-
-    final_output = io.BytesIO()
-    wb.save(final_output)
-    final_output.seek(0)
+    # Load, aggregate and export once per upload; widget reruns reuse the result.
+    def run_pipeline():
+        # --- READ MASTER FILE ---
+        lookup = load_master_lookup(master_file)
+
+        # --- READ CSV FILES ---
+        compiled_df, read_errors = load_bct_data(uploaded_csvs)
+        if compiled_df.empty:
+            return {'errors': read_errors, 'sheets': None}
+
+        # === SHEETS 1-3 (joined to the master by asset code) ===
+        asset_codes = lookup.encode(compiled_df['Asset Name'])
+        sheets = build_availability(compiled_df, lookup, asset_codes)
+
+        # === EXPORT TO EXCEL ===
+        return {
+            'errors': read_errors,
+            'unmatched': lookup.unmatched(compiled_df['Asset Name'], asset_codes),
+            'duplicates': describe_duplicates(lookup),
+            'sheets': sheets,
+            'excel': build_availability_excel(*sheets),
+        }
+
+    pipeline_key = (upload_signatures(master_file), upload_signatures(uploaded_csvs))
+    result = memoize_in_session("bct_pipeline", pipeline_key, run_pipeline)
+    for message in result['errors']:
+        st.error(message)
+    if result['sheets'] is None:
+        st.error("No valid rows found in the uploaded CSV files.")
+        st.stop()
+    if result['duplicates']:
+        st.warning(result['duplicates'])
+    if result['unmatched']:
+        st.warning(describe_unmatched(result['unmatched']))
+    sheet1, sheet2_pivot, sheet3_pivot = result['sheets']
+    final_output = result['excel']
 
     # === DISPLAY FUNCTIONS ===
-    def display_html_table(df, title):
+    def display_table(df, title, key):
         st.subheader(title)
-        html = df.head(50).to_html(classes='custom-table', index=False, escape=False)
-        st.markdown(html, unsafe_allow_html=True)
-
-    def display_status_table(df):
-        styled_df = df.copy()
-        for col in styled_df.columns[2:]:
-            styled_df[col] = styled_df[col].replace({
-                'Data Available': '<span style="background-color:#c6efce; color:#006100; padding:4px; border-radius:4px;">Available</span>',
-                'Data Not Available': '<span style="background-color:#ffc7ce; color:#9c0006; padding:4px; border-radius:4px;">Not Available</span>'
-            })
-        html = styled_df.to_html(escape=False, index=False, classes="custom-table")
-        st.markdown(html, unsafe_allow_html=True)
+        render_paged_grid(df, key)
+
+    def display_status_table(df, key):
+        render_paged_grid(df, key, column_rules=status_rules(df.columns[2:]), pinned=2)
+
+    # Sorting or paging a grid reruns only this fragment, not the load,
+    # aggregation and Excel build above it.
+    @st.fragment
+    def display_tables(sheet1, sheet2_pivot, sheet3_pivot):
+        display_table(sheet1, "🗂 Compiled Data", "compiled_data")
+        display_table(sheet2_pivot, "📊 Compiled Summary", "compiled_summary")
+        display_status_table(sheet3_pivot, "result_data")
 
     # === DISPLAY TABLES ===
     st.header("🔍 Preview of Processed Data")
-    display_html_table(sheet1, "🗂 Compiled Data")
-    display_html_table(sheet2_pivot, "📊 Compiled Summary")
-    display_status_table(sheet3_pivot)
+    display_tables(sheet1, sheet2_pivot, sheet3_pivot)
 
     # === DOWNLOAD BUTTON ===
     st.download_button(
         label="📥 Download Final Excel File",
         data=final_output,
         file_name=f"data_availability_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        on_click="ignore"
     )
 
 else:
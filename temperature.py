@@ -0,0 +1,312 @@
+# temperature.py
+
+from io import BytesIO
+
+import pandas as pd
+
+from memory_plan import CHUNK_ROWS, plan_memory
+from sniffing import sniff_csv, read_sniffed_csv, parse_timestamps
+
+# === Constants ===
+active_power_threshold = 500
+temp_exceed_limit = 90
+
+temp_columns = [
+    'Temperaturemeasurementforgeneratorbearingdriveend',
+    'Temperaturemeasurementforgeneratorbearingnondriveend',
+    'GearboxHighSpeedShaftDrivenEndtemp',
+    'GearboxHighSpeedShaftNonDrivenEndtemp',
+    'MeasuredTemperatureofrotorbearing',
+    'OilSumpTemp'
+]
+
+required_cols = temp_columns + ['Asset Name', 'ActivepowerGeneration', 'Date']
+
+thresholds = {
+    'Temperaturemeasurementforgeneratorbearingdriveend': 90,
+    'Temperaturemeasurementforgeneratorbearingnondriveend': 90,
+    'GearboxHighSpeedShaftDrivenEndtemp': 90,
+    'GearboxHighSpeedShaftNonDrivenEndtemp': 90,
+    'MeasuredTemperatureofrotorbearing': 60,
+    'OilSumpTemp': 80,
+}
+
+# Chunked runs keep per-asset maxima per time bucket instead of raw rows
+chart_bucket = '1h'
+
+temp_sniff = {'expected_columns': required_cols, 'timestamp_column': 'Date'}
+
+def prepare_temperature_frame(df, sniff):
+    if 'Date' in df.columns:
+        df['Date'] = parse_timestamps(df['Date'], sniff)
+    return df
+
+def plan_temperature_load(csv_files):
+    # The report repeats the rows on the Compiled and Filtered sheets.
+    return plan_memory(
+        csv_files, 'temperature', prepare_temperature_frame, temp_sniff, time_column='Date',
+        bucket_seconds=pd.Timedelta(chart_bucket).total_seconds(), export_copies=2,
+    )
+
+def process_data(csv_files, progress=None):
+    raw_dfs = []
+    errors = []
+    for i, file in enumerate(csv_files):
+        if progress:
+            progress(0.8 * i / len(csv_files), f"Reading {file.name}")
+        try:
+            sniff = sniff_csv(file, **temp_sniff)
+            df = prepare_temperature_frame(read_sniffed_csv(file, sniff, notes=errors), sniff)
+            if not df.empty:
+                raw_dfs.append(df)
+        except Exception as e:
+            errors.append(f"Error reading {file.name}: {e}")
+
+    if not raw_dfs:
+        raise ValueError("No valid CSV files loaded. " + " ".join(errors))
+
+    compiled_df = pd.concat(raw_dfs, ignore_index=True)
+
+    missing_cols = [col for col in required_cols if col not in compiled_df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing columns in data: {missing_cols}")
+
+    if progress:
+        progress(0.9, "Aggregating maxima")
+
+    filtered_df, max_df, result_df = analyse_temperature(compiled_df)
+    return compiled_df, filtered_df, max_df, result_df, errors
+
+def _bucket_max(df, value_cols):
+    keys = [df['Asset Name'], df['Date'].dt.floor(chart_bucket)]
+    return df.groupby(keys, dropna=False)[value_cols].max()
+
+def _combine_max(parts):
+    return pd.concat(parts).groupby(level=[0, 1], dropna=False).max()
+
+def process_data_chunked(csv_files, progress=None, chunk_rows=CHUNK_ROWS):
+    # Chunked counterpart of process_data for uploads too large to hold in
+    # memory. Each chunk is reduced to per-asset maxima per chart_bucket, so the
+    # compiled and filtered frames hold bucket maxima rather than raw rows; the
+    # per-asset maxima and the exceedance flags are exact.
+    compiled_parts = []
+    filtered_parts = []
+    errors = []
+    for i, file in enumerate(csv_files):
+        if progress:
+            progress(0.8 * i / len(csv_files), f"Streaming {file.name}")
+        try:
+            sniff = sniff_csv(file, **temp_sniff)
+            file_compiled, file_filtered = [], []
+            with read_sniffed_csv(file, sniff, notes=errors, chunksize=chunk_rows) as reader:
+                for chunk in reader:
+                    chunk = prepare_temperature_frame(chunk, sniff)
+                    value_cols = [col for col in temp_columns + ['ActivepowerGeneration'] if col in chunk.columns]
+                    file_compiled.append(_bucket_max(chunk, value_cols))
+                    file_filtered.append(_bucket_max(chunk[chunk['ActivepowerGeneration'] > 0], value_cols))
+                    if len(file_compiled) >= 16:
+                        file_compiled = [_combine_max(file_compiled)]
+                        file_filtered = [_combine_max(file_filtered)]
+            compiled_parts.extend(file_compiled)
+            filtered_parts.extend(file_filtered)
+        except Exception as e:
+            errors.append(f"Error reading {file.name}: {e}")
+
+    if not compiled_parts:
+        raise ValueError("No valid CSV files loaded. " + " ".join(errors))
+
+    compiled_df = _combine_max(compiled_parts).reset_index()
+    filtered_df = _combine_max(filtered_parts).reset_index()
+
+    missing_cols = [col for col in required_cols if col not in compiled_df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing columns in data: {missing_cols}")
+
+    if progress:
+        progress(0.9, "Aggregating maxima")
+
+    max_df = filtered_df.groupby('Asset Name')[temp_columns + ['ActivepowerGeneration']].max().reset_index()
+    return compiled_df, filtered_df, max_df, flag_exceedances(max_df), errors
+
+def analyse_temperature(compiled_df):
+    filtered_df = compiled_df[(compiled_df['ActivepowerGeneration'] > 0)]
+
+    max_df = filtered_df.groupby('Asset Name')[temp_columns + ['ActivepowerGeneration']].max().reset_index()
+
+    return filtered_df, max_df, flag_exceedances(max_df)
+
+def flag_exceedances(max_df):
+    result_df = max_df.copy()
+    result_df['Temp11'] = (result_df[temp_columns[0]] > 90).astype(int)
+    result_df['Temp22'] = (result_df[temp_columns[1]] > 90).astype(int)
+    result_df['Temp33'] = (result_df[temp_columns[2]] > 90).astype(int)
+    result_df['Temp44'] = (result_df[temp_columns[3]] > 90).astype(int)
+    result_df['Temp55'] = (result_df[temp_columns[4]] > 60).astype(int)
+    result_df['Temp66'] = (result_df[temp_columns[5]] > 80).astype(int)
+    result_df['TempSum'] = result_df[['Temp11', 'Temp22', 'Temp33', 'Temp44', 'Temp55', 'Temp66']].sum(axis=1)
+
+    return result_df
+
+def create_excel(compiled_df, filtered_df, max_df, result_df, aligned_df=None):
+    # Imported on first use so the page can render its upload form without openpyxl.
+    from openpyxl import Workbook
+    from openpyxl.styles import PatternFill, Font, Border, Side
+    from openpyxl.utils.dataframe import dataframe_to_rows
+    from openpyxl.utils import get_column_letter
+    from openpyxl.formatting.rule import ColorScaleRule
+
+    wb = Workbook()
+    ws1 = wb.active
+    ws1.title = "Compiled Data"
+    ws2 = wb.create_sheet("Filtered Data")
+    ws3 = wb.create_sheet("Max Data")
+    ws4 = wb.create_sheet("Result Data")
+
+    def write_df_to_sheet(ws, df):
+        for r in dataframe_to_rows(df, index=False, header=True):
+            ws.append(r)
+
+    write_df_to_sheet(ws1, compiled_df)
+    write_df_to_sheet(ws2, filtered_df)
+    write_df_to_sheet(ws3, max_df)
+    write_df_to_sheet(ws4, result_df)
+    if aligned_df is not None:
+        write_df_to_sheet(wb.create_sheet("Aligned Data"), aligned_df)
+
+    # Header formatting
+    header_fill = PatternFill(start_color='157B8F', end_color='157B8F', fill_type='solid')
+    bold_font = Font(bold=True)
+    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                         top=Side(style='thin'), bottom=Side(style='thin'))
+
+    for cell in ws4[1]:
+        cell.fill = header_fill
+        cell.font = bold_font
+        cell.border = thin_border
+
+    highlight_fill_90 = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+    highlight_fill_80 = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
+    highlight_fill_60 = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+    highlight_fill_neg = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+    green_fill = PatternFill(start_color='00A400', end_color='00A400', fill_type='solid')
+    yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+    red_fill = PatternFill(start_color='FF0000', end_color='FF0000', fill_type='solid')
+
+    def highlight_column_a(ws, row, fill):
+        ws.cell(row=row, column=1).fill = fill
+
+    col_names = [cell.value for cell in ws4[1]]
+
+    for row in ws4.iter_rows(min_row=2, max_row=ws4.max_row, min_col=1, max_col=ws4.max_column):
+        for cell in row:
+            col_name = col_names[cell.column - 1]
+            val = cell.value
+
+            if isinstance(val, (int, float)):
+                if col_name in temp_columns[:4] and val > 90:
+                    cell.fill = highlight_fill_90
+                elif col_name == 'OilSumpTemp' and val > 80:
+                    cell.fill = highlight_fill_80
+                elif col_name == 'MeasuredTemperatureofrotorbearing' and val > 60:
+                    cell.fill = highlight_fill_60
+                elif col_name.startswith('Temp') and 'TempSum' not in col_name and val > 0:
+                    cell.fill = highlight_fill_neg
+
+                if col_name == 'TempSum':
+                    if val == 0:
+                        cell.fill = green_fill
+                        highlight_column_a(ws4, cell.row, green_fill)
+                    elif val == 1:
+                        cell.fill = yellow_fill
+                        highlight_column_a(ws4, cell.row, yellow_fill)
+                    elif val > 1:
+                        cell.fill = red_fill
+                        highlight_column_a(ws4, cell.row, red_fill)
+
+    def apply_heatmap(ws, header_row=1, start_row=2):
+        headers = [cell.value for cell in ws[header_row]]
+        for col in temp_columns:
+            if col in headers:
+                idx = headers.index(col) + 1
+                col_letter = get_column_letter(idx)
+                rule = ColorScaleRule(
+                    start_type='min', start_color='63BE7B',
+                    mid_type='percentile', mid_value=50, mid_color='FFEB84',
+                    end_type='max', end_color='F8696B'
+                )
+                ws.conditional_formatting.add(f"{col_letter}{start_row}:{col_letter}{ws.max_row}", rule)
+
+    apply_heatmap(ws4)
+
+    excel_buffer = BytesIO()
+    wb.save(excel_buffer)
+    excel_buffer.seek(0)
+    return excel_buffer
+
+def plot_exceedance_charts_plotly(compiled_df, selected_metrics, secondary_metrics=None):
+    import plotly.express as px
+
+    charts = {}
+    for asset, group in compiled_df.groupby('Asset Name'):
+        # Always include all selected metrics
+        exceeded_cols = [col for col in selected_metrics if col in group.columns]
+
+        if not exceeded_cols:
+            continue
+
+        melted_df = group.melt(
+            id_vars=["Date"],
+            value_vars=exceeded_cols,
+            var_name="Metric",
+            value_name="Value"
+        )
+
+        # Add threshold limits for plotting (if applicable)
+        melted_df["Limit"] = melted_df["Metric"].map(thresholds)
+
+        fig = px.line(
+            melted_df,
+            x="Date",
+            y="Value",
+            color="Metric",
+            title=f"📈 Temperature Chart for {asset}",
+            template="plotly_dark",
+            markers=True
+        )
+
+        # Add threshold lines
+        for metric in exceeded_cols:
+            limit = thresholds.get(metric)
+            if limit:
+                fig.add_hline(
+                    y=limit,
+                    line_dash="dash",
+                    line_color="white",
+                    annotation_text=f"{metric} Limit: {limit}°C",
+                    annotation_position="top right"
+                )
+
+        fig.update_layout(
+            xaxis_title="Date",
+            yaxis_title="Temperature (°C)",
+            hovermode="x unified"
+        )
+
+        # Aligned power/wind series share the time axis, each on its own right-hand
+        # y-axis (kW and m/s differ by two orders of magnitude)
+        secondary = [col for col in (secondary_metrics or []) if col in group.columns and group[col].notna().any()]
+        if secondary:
+            right_edge = 1 - 0.08 * (len(secondary) - 1)
+            fig.update_layout(xaxis=dict(domain=[0, right_edge]))
+        for i, metric in enumerate(secondary):
+            axis = f"y{i + 2}"
+            fig.add_scatter(x=group["Date"], y=group[metric], name=metric, yaxis=axis,
+                            mode="lines", line=dict(dash="dot"))
+            fig.update_layout({f"yaxis{i + 2}": dict(
+                title=metric, overlaying="y", side="right", showgrid=False,
+                anchor="x" if i == 0 else "free", position=min(1.0, right_edge + 0.08 * i),
+            )})
+
+        charts[asset] = fig
+
+    return charts